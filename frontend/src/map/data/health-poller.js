@@ -1,6 +1,13 @@
+const WEBHOOK_HISTORY = 50;
+// Subscribes to /api/events (server-sent events) for webhook and health pushes.
+// Falls back to interval polling when EventSource is unavailable or the server
+// refuses the stream (e.g. too many clients). Health keeps being polled when the
+// server says it does not push health (no background snapshot configured).
 export class HealthPoller {
     healthTimer = null;
     webhookTimer = null;
+    events = null;
+    webhooks = { count: 0, results: [] };
     onHealth;
     onWebhook;
     constructor(onHealth, onWebhook) {
@@ -10,15 +17,52 @@ export class HealthPoller {
     start() {
         this.pollHealth();
         this.pollWebhooks();
-        this.healthTimer = setInterval(() => this.pollHealth(), 30_000);
-        this.webhookTimer = setInterval(() => this.pollWebhooks(), 15_000);
+        if (typeof EventSource === 'undefined') {
+            this.startPolling();
+            return;
+        }
+        this.events = new EventSource('/api/events');
+        this.events.addEventListener('ready', (e) => {
+            const { health_push } = JSON.parse(e.data);
+            if (!health_push)
+                this.startHealthPolling();
+        });
+        this.events.addEventListener('health', (e) => {
+            this.onHealth(JSON.parse(e.data));
+        });
+        this.events.addEventListener('webhook', (e) => {
+            const result = JSON.parse(e.data);
+            this.webhooks = {
+                count: this.webhooks.count + 1,
+                results: [result, ...this.webhooks.results].slice(0, WEBHOOK_HISTORY),
+            };
+            this.onWebhook(this.webhooks);
+        });
+        this.events.onerror = () => {
+            // EventSource retries on its own; CLOSED means the server refused the stream
+            if (this.events?.readyState === EventSource.CLOSED) {
+                this.events = null;
+                this.startPolling();
+            }
+        };
     }
     stop() {
+        this.events?.close();
+        this.events = null;
         if (this.healthTimer)
             clearInterval(this.healthTimer);
         if (this.webhookTimer)
             clearInterval(this.webhookTimer);
     }
+    startPolling() {
+        this.startHealthPolling();
+        if (!this.webhookTimer)
+            this.webhookTimer = setInterval(() => this.pollWebhooks(), 15_000);
+    }
+    startHealthPolling() {
+        if (!this.healthTimer)
+            this.healthTimer = setInterval(() => this.pollHealth(), 30_000);
+    }
     async pollHealth() {
         try {
             const res = await fetch('/api/health');
@@ -54,6 +98,7 @@ export class HealthPoller {
             const res = await fetch('/api/webhook-results');
             if (res.ok) {
                 const data = await res.json();
+                this.webhooks = data;
                 this.onWebhook(data);
             }
         }
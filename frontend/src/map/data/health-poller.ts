@@ -1,11 +1,19 @@
-import type { HealthResponse, WebhookResponse } from './types';
+import type { HealthResponse, WebhookResponse, WebhookResult } from './types';
 
 export type HealthCallback = (data: HealthResponse) => void;
 export type WebhookCallback = (data: WebhookResponse) => void;
 
+const WEBHOOK_HISTORY = 50;
+
+// Subscribes to /api/events (server-sent events) for webhook and health pushes.
+// Falls back to interval polling when EventSource is unavailable or the server
+// refuses the stream (e.g. too many clients). Health keeps being polled when the
+// server says it does not push health (no background snapshot configured).
 export class HealthPoller {
   private healthTimer: ReturnType<typeof setInterval> | null = null;
   private webhookTimer: ReturnType<typeof setInterval> | null = null;
+  private events: EventSource | null = null;
+  private webhooks: WebhookResponse = { count: 0, results: [] };
   private onHealth: HealthCallback;
   private onWebhook: WebhookCallback;
 
@@ -17,15 +25,51 @@ export class HealthPoller {
   start(): void {
     this.pollHealth();
     this.pollWebhooks();
-    this.healthTimer = setInterval(() => this.pollHealth(), 30_000);
-    this.webhookTimer = setInterval(() => this.pollWebhooks(), 15_000);
+    if (typeof EventSource === 'undefined') {
+      this.startPolling();
+      return;
+    }
+    this.events = new EventSource('/api/events');
+    this.events.addEventListener('ready', (e) => {
+      const { health_push } = JSON.parse((e as MessageEvent).data);
+      if (!health_push) this.startHealthPolling();
+    });
+    this.events.addEventListener('health', (e) => {
+      this.onHealth(JSON.parse((e as MessageEvent).data));
+    });
+    this.events.addEventListener('webhook', (e) => {
+      const result: WebhookResult = JSON.parse((e as MessageEvent).data);
+      this.webhooks = {
+        count: this.webhooks.count + 1,
+        results: [result, ...this.webhooks.results].slice(0, WEBHOOK_HISTORY),
+      };
+      this.onWebhook(this.webhooks);
+    });
+    this.events.onerror = () => {
+      // EventSource retries on its own; CLOSED means the server refused the stream
+      if (this.events?.readyState === EventSource.CLOSED) {
+        this.events = null;
+        this.startPolling();
+      }
+    };
   }
 
   stop(): void {
+    this.events?.close();
+    this.events = null;
     if (this.healthTimer) clearInterval(this.healthTimer);
     if (this.webhookTimer) clearInterval(this.webhookTimer);
   }
 
+  private startPolling(): void {
+    this.startHealthPolling();
+    if (!this.webhookTimer) this.webhookTimer = setInterval(() => this.pollWebhooks(), 15_000);
+  }
+
+  private startHealthPolling(): void {
+    if (!this.healthTimer) this.healthTimer = setInterval(() => this.pollHealth(), 30_000);
+  }
+
   private async pollHealth(): Promise<void> {
     try {
       const res = await fetch('/api/health');
@@ -60,6 +104,7 @@ export class HealthPoller {
       const res = await fetch('/api/webhook-results');
       if (res.ok) {
         const data: WebhookResponse = await res.json();
+        this.webhooks = data;
         this.onWebhook(data);
       }
     } catch {
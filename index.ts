@@ -73,6 +73,7 @@ const app = new digitalocean.App("cnnct-app", {
                     type: "SECRET",
                 },
                 { key: "WEBHOOK_DNS_TARGET", value: config.get("webhookDnsTarget") || "example.com" },
+                { key: "HEALTH_SNAPSHOT_INTERVAL", value: config.get("healthSnapshotInterval") || "15" },
                 ...(config.get("webhookTimerInterval") ? [{
                     key: "WEBHOOK_TIMER_INTERVAL",
                     value: config.get("webhookTimerInterval")!,
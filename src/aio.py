@@ -0,0 +1,40 @@
+"""Process-wide asyncio event loop for non-blocking network I/O from sync views."""
+import asyncio
+import os
+import threading
+
+
+class BackgroundLoop:
+    """Runs one asyncio event loop in a daemon thread per process.
+
+    Request threads submit coroutines with `submit()`/`run()` and only wait on
+    their own result, while every socket is multiplexed on the shared loop.
+    The loop starts lazily and is recreated after fork, so Gunicorn workers
+    never inherit the master's (dead) loop thread.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="aio-loop", daemon=True)
+                thread.start()
+                self._loop, self._pid = loop, os.getpid()
+            return self._loop
+
+    def submit(self, coro):
+        """Schedule a coroutine on the loop and return a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the loop and block the calling thread for its result."""
+        return self.submit(coro).result(timeout)
+
+
+background_loop = BackgroundLoop()
@@ -1,25 +1,73 @@
 import os
 import logging
 import sys
-import socket
-import requests
+import threading
 import time
+import atexit
+import base64
+import hashlib
+import io
 import json
+import queue
+import uuid
 import dns.resolver  # Requires dnspython in requirements.txt
 import redis
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
 from flask import Flask, g, request, jsonify, Response
 from datetime import datetime, timezone
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from werkzeug.middleware.proxy_fix import ProxyFix
 from contextlib import contextmanager
+from xml.sax.saxutils import XMLGenerator  # nosec B406 - only writes the RSS feed, never parses XML
 from flask_migrate import Migrate
+from sqlalchemy import select, tuple_
 
 try:
     from models import Base, WebhookEvent, get_engine, get_session_factory
 except ImportError:
     from src.models import Base, WebhookEvent, get_engine, get_session_factory
 
+try:
+    from event_stream import EventBroker
+except ImportError:
+    from src.event_stream import EventBroker
+
+try:
+    from result_ring import ResultRing
+except ImportError:
+    from src.result_ring import ResultRing
+
+try:
+    from webhook_writer import WebhookWriter
+except ImportError:
+    from src.webhook_writer import WebhookWriter
+
+try:
+    from dns_cache import DNSCache
+except ImportError:
+    from src.dns_cache import DNSCache
+
+try:
+    from probe import iter_probes, run_probes, sample_connect
+except ImportError:
+    from src.probe import iter_probes, run_probes, sample_connect
+
+try:
+    from http_diag import connection_info, create_session, read_body
+except ImportError:
+    from src.http_diag import connection_info, create_session, read_body
+
+try:
+    from metrics import MetricsRegistry
+except ImportError:
+    from src.metrics import MetricsRegistry
+
+try:
+    from request_log import RequestLogSampler
+except ImportError:
+    from src.request_log import RequestLogSampler
+
 try:
     from opensearch_handler import _parse_opensearch_url
 except ImportError:
@@ -39,8 +87,23 @@ logging.basicConfig(
     handlers=[logging.StreamHandler(sys.stdout)]
 )
 
+# Prometheus-style metrics; METRICS_DIR shares them between Gunicorn workers
+metrics = MetricsRegistry(os.environ.get("METRICS_DIR") or None)
+metrics.counter("cnnct_http_requests_total", "HTTP requests by endpoint, method and status code.")
+metrics.histogram("cnnct_http_request_duration_seconds", "HTTP request latency by endpoint and method.")
+metrics.counter("cnnct_probe_total", "Probe and webhook storage outcomes.")
+metrics.counter("cnnct_log_records_total", "Log records shipped to OpenSearch by handler and outcome.")
+
+
+def _log_record_counter(handler):
+    """on_count callback for an OpenSearchHandler, exporting its stats() counters."""
+    return lambda outcome: metrics.inc("cnnct_log_records_total", handler=handler, outcome=outcome)
+
+
 # Attach OpenSearch handlers if OPENSEARCH_URL is configured
 _opensearch_url = os.environ.get("OPENSEARCH_URL")
+_os_handler = None
+_req_handler = None
 _request_logger = None
 if _opensearch_url:
     try:
@@ -48,12 +111,20 @@ if _opensearch_url:
             from opensearch_handler import OpenSearchHandler
         except ImportError:
             from src.opensearch_handler import OpenSearchHandler
+        _os_buffer_options = {
+            "max_buffer": int(os.environ.get("OPENSEARCH_MAX_BUFFER", OpenSearchHandler.MAX_BUFFER_SIZE)),
+            "overflow": os.environ.get("OPENSEARCH_OVERFLOW_POLICY", "drop_oldest"),
+            "spill_dir": os.environ.get("OPENSEARCH_SPILL_DIR") or None,
+            "spill_max_bytes": int(os.environ.get("OPENSEARCH_SPILL_MAX_MB", 256)) * 1024 * 1024,
+        }
         # App logs → cnnct-logs-*
-        _os_handler = OpenSearchHandler(_opensearch_url)
+        _os_handler = OpenSearchHandler(_opensearch_url, on_count=_log_record_counter("logs"),
+                                        **_os_buffer_options)
         _os_handler.setLevel(logging.INFO)
         logging.getLogger().addHandler(_os_handler)
         # API request logs → cnnct-requests-*
-        _req_handler = OpenSearchHandler(_opensearch_url, index_prefix="cnnct-requests")
+        _req_handler = OpenSearchHandler(_opensearch_url, index_prefix="cnnct-requests",
+                                         on_count=_log_record_counter("requests"), **_os_buffer_options)
         _req_handler.setLevel(logging.INFO)
         _request_logger = logging.getLogger("cnnct.requests")
         _request_logger.addHandler(_req_handler)
@@ -62,24 +133,66 @@ if _opensearch_url:
     except Exception as e:
         print(f"[WARNING] OpenSearch handler init failed, continuing without it: {e}", file=sys.stderr)
 
+# Request log mode: "full" ships one document per request, "sampled" keeps every
+# error and slow request, samples the rest and rolls up per-endpoint summaries
+_request_log_mode = os.environ.get("REQUEST_LOG_MODE", "full")
+_request_sampler = None
+
+
+def _emit_request_summary(summary):
+    _request_logger.info("request_summary", extra={"extra_fields": {"type": "request_summary", **summary}})
+
+
+if _request_logger is not None and _request_log_mode == "sampled":
+    _request_sampler = RequestLogSampler(
+        _emit_request_summary,
+        sample_rate=float(os.environ.get("REQUEST_LOG_SAMPLE_RATE", 0.1)),
+        slow_ms=float(os.environ.get("REQUEST_LOG_SLOW_MS", 1000)),
+        interval=float(os.environ.get("REQUEST_LOG_SUMMARY_INTERVAL", 60)),
+    )
+    # Ship the last partial summary window; runs before logging's own atexit
+    # shutdown (registered earlier), so the OpenSearch handler still flushes it
+    atexit.register(_request_sampler.close)
+
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.wsgi_app = ProxyFix(app.wsgi_app, x_for=2)
 
+
+def _count_probe(probe: str, outcome: str):
+    metrics.inc("cnnct_probe_total", probe=probe, outcome=outcome)
+
+
 # Request logging hooks
 @app.before_request
 def _record_request_start():
     g.request_start = time.perf_counter()
 
 
+@app.after_request
+def _record_request_metrics(response):
+    elapsed = time.perf_counter() - g.get("request_start", time.perf_counter())
+    endpoint = request.endpoint or "unmatched"
+    metrics.inc("cnnct_http_requests_total", endpoint=endpoint, method=request.method,
+                status=str(response.status_code))
+    metrics.observe("cnnct_http_request_duration_seconds", elapsed, endpoint=endpoint, method=request.method)
+    return response
+
+
 @app.after_request
 def _log_request(response):
     if _request_logger is None:
         return response
-    if request.path == "/healthz":
+    if request.path in ("/healthz", "/metrics", "/events"):
         return response
     latency_ms = round((time.perf_counter() - g.get("request_start", time.perf_counter())) * 1000, 2)
+    sample_fields = {}
+    if _request_sampler is not None:
+        sample_rate = _request_sampler.observe(request.endpoint, request.method, response.status_code, latency_ms)
+        if sample_rate is None:
+            return response
+        sample_fields = {"sample_rate": sample_rate}
     params = dict(request.args)
     if not params and request.is_json:
         try:
@@ -99,6 +212,7 @@ def _log_request(response):
             "client_ip": request.remote_addr,
             "params": params,
             "user_agent": request.headers.get("User-Agent", ""),
+            **sample_fields,
         }}
     )
     return response
@@ -110,6 +224,14 @@ migrate = Migrate()
 # Configure Rate Limiting
 redis_url = os.environ.get("REDIS_URL", "memory://")
 
+# Process-wide Valkey client for health/status checks (see _get_valkey_client)
+_valkey_client = None
+_valkey_client_lock = threading.Lock()
+
+# Process-wide OpenSearch client for health checks (see _get_opensearch_client)
+_opensearch_client = None
+_opensearch_client_lock = threading.Lock()
+
 # Database configuration
 database_url = os.environ.get("DATABASE_URL", "")
 _db_engine = None
@@ -120,9 +242,66 @@ _use_postgres = False
 webhook_secret = os.environ.get("WEBHOOK_SECRET", "")
 webhook_dns_target = os.environ.get("WEBHOOK_DNS_TARGET", "example.com")
 
-# In-memory fallback for webhook results when PostgreSQL is unavailable
-_webhook_results_memory: list = []
+# Shared DNS answer cache (local LRU, mirrored to Valkey when configured)
+_dns_cache = DNSCache(
+    max_entries=int(os.environ.get("DNS_CACHE_SIZE", 1024)),
+    max_ttl=int(os.environ.get("DNS_CACHE_MAX_TTL", 300)),
+    negative_ttl=int(os.environ.get("DNS_CACHE_NEGATIVE_TTL", 30)),
+    redis_url=os.environ.get("DNS_CACHE_URL", redis_url),
+)
+
+# Record types served by the batch DNS endpoint, resolved concurrently
+DNS_RECORD_TYPES = ("A", "AAAA", "MX", "NS", "TXT", "CNAME")
+_dns_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("DNS_BATCH_WORKERS", 12)),
+    thread_name_prefix="dns-batch",
+)
+
+# /health runs its backend checks concurrently, bounded by a global deadline
+HEALTH_CHECK_DEADLINE = float(os.environ.get("HEALTH_CHECK_DEADLINE", 3.0))
+_health_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="health")
+# At most one run of each check is in flight; a hung check is reused, not resubmitted
+_health_inflight: dict = {}
+_health_inflight_lock = threading.Lock()
+
+# Bulk TCP probe limits
+BULK_PROBE_MAX = int(os.environ.get("BULK_PROBE_MAX", 500))
+BULK_PROBE_MAX_CONCURRENCY = int(os.environ.get("BULK_PROBE_MAX_CONCURRENCY", 200))
+BULK_PROBE_MAX_TIMEOUT = 10.0
+
+# /cnnct sampling mode limits
+CNNCT_MAX_SAMPLES = int(os.environ.get("CNNCT_MAX_SAMPLES", 20))
+CNNCT_MAX_INTERVAL_MS = 1000
+CNNCT_PORT = 443  # reported as "tcp_443"; tests/benchmark.py points it at a local listener
+
+# Keep-alive session for /diag; connections record DNS/connect/TLS timings
+_diag_session = create_session(
+    pool_hosts=int(os.environ.get("DIAG_POOL_HOSTS", 10)),
+    pool_size=int(os.environ.get("DIAG_POOL_SIZE", 10)),
+)
+DIAG_MAX_BYTES = int(os.environ.get("DIAG_MAX_BYTES", 10 * 1024 * 1024))
+DIAG_MAX_SECONDS = float(os.environ.get("DIAG_MAX_SECONDS", 10))
+DIAG_CHUNK_SIZE = int(os.environ.get("DIAG_CHUNK_SIZE", 64 * 1024))
+
+# Server-sent events (/events), fanned out across workers over Valkey pub/sub
+_event_broker = EventBroker(
+    os.environ.get("EVENTS_URL", redis_url),
+    max_clients=int(os.environ.get("SSE_MAX_CLIENTS", 32)),
+)
+
 WEBHOOK_RESULTS_MAX = 50
+# Fallback for webhook results when PostgreSQL is unavailable, shared by all workers
+# through a capped Valkey list, or a memory-mapped file at WEBHOOK_MEMORY_PATH without Valkey
+_webhook_results_memory = ResultRing(
+    os.environ.get("WEBHOOK_MEMORY_URL", redis_url),
+    path=os.environ.get("WEBHOOK_MEMORY_PATH"),
+    max_items=int(os.environ.get("WEBHOOK_MEMORY_MAX", WEBHOOK_RESULTS_MAX)),
+    slot_bytes=int(os.environ.get("WEBHOOK_MEMORY_SLOT_BYTES", 8192)),
+)
+WEBHOOK_RESULTS_PAGE_MAX = int(os.environ.get("WEBHOOK_RESULTS_PAGE_MAX", 200))
+# Fields selectable with /webhook-results?fields=; id and timestamp are always included
+WEBHOOK_RESULT_FIELDS = ("id", "timestamp", "event_type", "source_ip", "dns_target",
+                         "dns_records", "dns_error", "payload")
 limiter = Limiter(
     get_remote_address,
     app=app,
@@ -172,24 +351,102 @@ def get_db_session():
 # Initialize database at module load
 init_database()
 
+# Write-behind buffer: webhook events are inserted in batches, one transaction each
+_webhook_writer = None
+_webhook_write_batch = int(os.environ.get("WEBHOOK_WRITE_BATCH", 100))
+if _use_postgres and _webhook_write_batch > 0:
+    _webhook_writer = WebhookWriter(
+        _db_session_factory,
+        WebhookEvent,
+        on_flush=lambda rows, error: _on_webhook_flush(rows, error),
+        batch_size=_webhook_write_batch,
+        flush_interval=float(os.environ.get("WEBHOOK_WRITE_INTERVAL", 1.0)),
+        max_pending=int(os.environ.get("WEBHOOK_WRITE_MAX_PENDING", 5000)),
+    )
+    atexit.register(_webhook_writer.close)
+
+# Pre-creates webhook_events partitions and drops those past WEBHOOK_RETENTION_DAYS (0 keeps all)
+_partition_maintainer = None
+if _use_postgres:
+    try:
+        from partitions import PartitionMaintainer
+    except ImportError:
+        from src.partitions import PartitionMaintainer
+    _partition_maintainer = PartitionMaintainer(
+        _db_engine,
+        retention_days=int(os.environ.get("WEBHOOK_RETENTION_DAYS", 0)),
+        interval=os.environ.get("WEBHOOK_PARTITION_INTERVAL", "month"),
+        premake=int(os.environ.get("WEBHOOK_PARTITION_PREMAKE", 2)),
+        check_interval=float(os.environ.get("WEBHOOK_PARTITION_CHECK_INTERVAL", 3600)),
+    )
+
 @app.route('/healthz')
 @limiter.exempt
 def health_check():
     return jsonify({"status": "healthy"}), 200
 
 
-def _resolve_dns(domain: str) -> tuple[list[str], str | None]:
-    """Resolve DNS A records for a domain.
+def _resolve_dns(domain: str, rdtype: str = "A", cache_info: dict | None = None) -> tuple[list[str], str | None]:
+    """Resolve DNS records for a domain, serving fresh answers from the cache.
+
+    NXDOMAIN/NoAnswer results are cached briefly as negative answers. If
+    `cache_info` is given it is filled with `hit` and `ttl_remaining` so
+    callers can report whether a latency figure reflects an upstream lookup.
 
     Returns:
-        Tuple of (list of IP addresses, error message or None)
+        Tuple of (list of record values, error message or None)
     """
+    cached = _dns_cache.get(domain, rdtype)
+    if cached is not None:
+        records, error, ttl_remaining = cached
+        if cache_info is not None:
+            cache_info.update(hit=True, ttl_remaining=ttl_remaining)
+        return records, error
+
+    ttl_remaining = 0
     try:
-        result = dns.resolver.resolve(domain, 'A')
-        return [ip.to_text() for ip in result], None
+        result = dns.resolver.resolve(domain, rdtype)
+        records = [r.to_text() for r in result]
+        ttl = getattr(getattr(result, "rrset", None), "ttl", 0)
+        if isinstance(ttl, int):
+            ttl_remaining = _dns_cache.set(domain, rdtype, records, ttl=ttl)
+        error = None
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+        logger.error(f"DNS lookup failed for {domain}: {str(e)}")
+        records, error = [], str(e)
+        ttl_remaining = _dns_cache.set(domain, rdtype, records, error=error)
     except Exception as e:
         logger.error(f"DNS lookup failed for {domain}: {str(e)}")
-        return [], str(e)
+        records, error = [], str(e)
+
+    if cache_info is not None:
+        cache_info.update(hit=False, ttl_remaining=ttl_remaining)
+    return records, error
+
+
+def _get_valkey_client():
+    """Return the process-wide pooled Valkey/Redis client, creating it on first use."""
+    global _valkey_client
+    with _valkey_client_lock:
+        if _valkey_client is None:
+            _valkey_client = redis.from_url(
+                redis_url,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+                health_check_interval=30,
+            )
+        return _valkey_client
+
+
+def _valkey_pool_stats(client) -> dict:
+    """Summarize the client's connection pool (reads redis-py pool internals)."""
+    pool = client.connection_pool
+    created = getattr(pool, "_created_connections", None)
+    return {
+        "created_connections": created if isinstance(created, int) else None,
+        "in_use_connections": len(getattr(pool, "_in_use_connections", ())),
+        "idle_connections": len(getattr(pool, "_available_connections", ())),
+    }
 
 
 def _check_valkey_health() -> dict:
@@ -202,17 +459,23 @@ def _check_valkey_health() -> dict:
         }
     try:
         start_time = time.perf_counter()
-        r = redis.from_url(redis_url, socket_connect_timeout=5, socket_timeout=5)
-        info = r.info(section="server")
+        r = _get_valkey_client()
+        # One round trip for all three sections
+        pipe = r.pipeline(transaction=False)
+        pipe.info(section="server")
+        pipe.info(section="clients")
+        pipe.info(section="memory")
+        server, clients, memory = pipe.execute()
         latency = (time.perf_counter() - start_time) * 1000
         return {
             "backend": "redis",
             "connected": True,
             "latency_ms": round(latency, 2),
-            "version": info.get("redis_version", "unknown"),
-            "uptime_seconds": info.get("uptime_in_seconds", 0),
-            "connected_clients": r.info(section="clients").get("connected_clients", 0),
-            "used_memory_human": r.info(section="memory").get("used_memory_human", "unknown"),
+            "version": server.get("redis_version", "unknown"),
+            "uptime_seconds": server.get("uptime_in_seconds", 0),
+            "connected_clients": clients.get("connected_clients", 0),
+            "used_memory_human": memory.get("used_memory_human", "unknown"),
+            "pool": _valkey_pool_stats(r),
         }
     except Exception as e:
         logger.error(f"Redis status check failed: {str(e)}")
@@ -253,6 +516,46 @@ def _check_postgres_health() -> dict:
         return {"backend": "postgres", "connected": False, "error": str(e)}
 
 
+def _get_opensearch_client():
+    """Return (client, setup_ms), building and warming the client once per process.
+
+    Reuses the log handler's client (and its urllib3 pool) when there is one.
+    `setup_ms` covers client creation plus the warm-up ping that opens the
+    TCP/TLS connection, and is None when an already-warm client was reused.
+    """
+    global _opensearch_client
+    with _opensearch_client_lock:
+        if _opensearch_client is not None:
+            return _opensearch_client, None
+        start_time = time.perf_counter()
+        if _os_handler is not None and _os_handler.client is not None:
+            client = _os_handler.client
+        else:
+            from opensearchpy import OpenSearch
+            scheme, auth, host, port = _parse_opensearch_url(_opensearch_url)
+            client = OpenSearch(
+                hosts=[{"host": host, "port": port}],
+                http_auth=auth,
+                use_ssl=(scheme == "https"),
+                verify_certs=False,  # nosec B501 - internal OpenSearch cluster
+                ssl_show_warn=False,
+                timeout=5,
+            )
+        if not client.ping():
+            raise ConnectionError("OpenSearch ping failed")
+        _opensearch_client = client
+        return client, (time.perf_counter() - start_time) * 1000
+
+
+def _opensearch_shipping_stats() -> dict:
+    """Log shipping counters for the app and request log handlers."""
+    return {
+        name: handler.stats()
+        for name, handler in (("logs", _os_handler), ("requests", _req_handler))
+        if handler is not None
+    }
+
+
 def _check_opensearch_health() -> dict:
     """Check OpenSearch connectivity and return health info."""
     if not _opensearch_url:
@@ -260,16 +563,7 @@ def _check_opensearch_health() -> dict:
     if not _parse_opensearch_url:
         return {"configured": True, "connected": False, "status": "parser_unavailable"}
     try:
-        from opensearchpy import OpenSearch
-        scheme, auth, host, port = _parse_opensearch_url(_opensearch_url)
-        client = OpenSearch(
-            hosts=[{"host": host, "port": port}],
-            http_auth=auth,
-            use_ssl=(scheme == "https"),
-            verify_certs=False,  # nosec B501 - internal OpenSearch cluster
-            ssl_show_warn=False,
-            connection_class=None,
-        )
+        client, setup_ms = _get_opensearch_client()
         start_time = time.perf_counter()
         health = client.cluster.health()
         latency = (time.perf_counter() - start_time) * 1000
@@ -279,20 +573,117 @@ def _check_opensearch_health() -> dict:
             "status": health.get("status", "unknown"),
             "number_of_nodes": health.get("number_of_nodes", 0),
             "latency_ms": round(latency, 2),
+            "connection_setup_ms": round(setup_ms, 2) if setup_ms is not None else 0,
+            "client_reused": setup_ms is None,
+            "shipping": _opensearch_shipping_stats(),
         }
     except Exception as e:
         logger.error(f"OpenSearch health check failed: {str(e)}")
         return {"configured": True, "connected": False, "status": "error", "error": str(e)}
 
 
+def _check_dns_canary() -> dict:
+    """Resolve the canary domain and return health info."""
+    start_time = time.perf_counter()
+    cache_info = {}
+    records, error = _resolve_dns(_canary_domain, cache_info=cache_info)
+    latency = (time.perf_counter() - start_time) * 1000
+    return {
+        "domain": _canary_domain,
+        "ok": len(records) > 0,
+        "records": records,
+        "latency_ms": round(latency, 2),
+        "error": error,
+        "cache_hit": cache_info.get("hit", False),
+        "ttl_remaining": cache_info.get("ttl_remaining", 0),
+    }
+
+
+def _run_health_checks(checks: dict, deadline: float) -> dict:
+    """Run named health checks concurrently and collect results by name.
+
+    Checks still running when `deadline` seconds have passed are reported as
+    `{"status": "timeout", ...}` and left to finish in the background, so the
+    caller waits for the slowest check or the deadline, whichever is first.
+    A check whose previous run has not finished is not started again: callers
+    wait on the run in flight, so a hung backend occupies one pool thread and
+    never queues the checks of healthy backends behind it.
+    """
+    futures = {}
+    with _health_inflight_lock:
+        for name, check in checks.items():
+            future = _health_inflight.get(name)
+            if future is None or future.done():
+                future = _health_inflight[name] = _health_executor.submit(check)
+            futures[name] = future
+    done, _ = wait_futures(futures.values(), timeout=deadline)
+    results = {}
+    for name, future in futures.items():
+        if future not in done:
+            logger.warning(f"Health check {name} exceeded {deadline}s deadline")
+            results[name] = {"connected": False, "status": "timeout",
+                             "error": f"Health check exceeded {deadline}s deadline"}
+            continue
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            logger.error(f"Health check {name} failed: {str(e)}")
+            results[name] = {"connected": False, "status": "error", "error": str(e)}
+    return results
+
+
 # Nginx proxies /api/dns/<domain> to /dns/<domain>
 @app.route('/dns/<domain>', methods=['GET'])
 @limiter.limit("10 per minute")
 def check_dns(domain):
-    records, error = _resolve_dns(domain)
+    cache_info = {}
+    records, error = _resolve_dns(domain, cache_info=cache_info)
+    _count_probe("dns", "error" if error else "success")
     if error:
-        return jsonify({"error": error}), 400
-    return jsonify({"target": domain, "records": records, "timestamp": time.time()})
+        return jsonify({"error": error, "cache": cache_info}), 400
+    return jsonify({"target": domain, "records": records, "timestamp": time.time(), "cache": cache_info})
+
+def _timed_resolve(domain: str, rdtype: str) -> dict:
+    """Resolve one record type and report its latency and cache status."""
+    cache_info = {}
+    start_time = time.perf_counter()
+    records, error = _resolve_dns(domain, rdtype, cache_info=cache_info)
+    latency = (time.perf_counter() - start_time) * 1000
+    return {
+        "records": records,
+        "error": error,
+        "latency_ms": round(latency, 2),
+        "cache": cache_info,
+    }
+
+
+# Nginx proxies /api/dns/<domain>/records to /dns/<domain>/records
+@app.route('/dns/<domain>/records', methods=['GET'])
+@limiter.limit("10 per minute")
+def check_dns_records(domain):
+    """Resolve several record types for a domain in parallel."""
+    types_param = request.args.get('types')
+    rdtypes = [t.strip().upper() for t in types_param.split(',') if t.strip()] if types_param else list(DNS_RECORD_TYPES)
+    unsupported = [t for t in rdtypes if t not in DNS_RECORD_TYPES]
+    if unsupported or not rdtypes:
+        return jsonify({
+            "error": f"Unsupported record types: {', '.join(unsupported) or '(none)'}",
+            "supported": list(DNS_RECORD_TYPES),
+        }), 400
+    rdtypes = list(dict.fromkeys(rdtypes))
+
+    start_time = time.perf_counter()
+    futures = {t: _dns_executor.submit(_timed_resolve, domain, t) for t in rdtypes}
+    records = {t: f.result() for t, f in futures.items()}
+    total = (time.perf_counter() - start_time) * 1000
+    for result in records.values():
+        _count_probe("dns", "error" if result["error"] else "success")
+    return jsonify({
+        "target": domain,
+        "records": records,
+        "total_ms": round(total, 2),
+        "timestamp": time.time(),
+    })
 
 # Nginx proxies /api/cnnct to /cnnct
 @app.route('/cnnct', methods=['GET'])
@@ -301,16 +692,93 @@ def cnnct():
     if not target:
         return jsonify({"error": "No target specified"}), 400
 
-    results = {"target": target, "tcp_443": False, "latency_ms": None}
-    start_time = time.perf_counter()
+    if 'samples' in request.args:
+        try:
+            samples = int(request.args['samples'])
+            interval_ms = int(request.args.get('interval_ms', 100))
+        except ValueError:
+            return jsonify({"error": "samples and interval_ms must be integers"}), 400
+        if not 1 <= samples <= CNNCT_MAX_SAMPLES or not 0 <= interval_ms <= CNNCT_MAX_INTERVAL_MS:
+            return jsonify({
+                "error": f"samples must be 1-{CNNCT_MAX_SAMPLES} and interval_ms 0-{CNNCT_MAX_INTERVAL_MS}"
+            }), 400
+        sampled = sample_connect(target, CNNCT_PORT, samples, interval_ms / 1000, timeout=3)
+        _count_probe("tcp", "open" if sampled["received"] else "closed")
+        if sampled["error"]:
+            logger.info(f"Connection failed to {target}: {sampled['error']}")
+        return jsonify({
+            "target": target,
+            "tcp_443": sampled["received"] > 0,
+            "latency_ms": sampled["stats"]["p50"] if sampled["stats"] else None,
+            "interval_ms": interval_ms,
+            **sampled,
+        })
+
+    probe = run_probes([(target, CNNCT_PORT)], concurrency=1, timeout=3)[0]
+    _count_probe("tcp", "open" if probe["open"] else "closed")
+    if not probe["open"]:
+        logger.info(f"Connection failed to {target}: {probe['error']}")
+    return jsonify({"target": target, "tcp_443": probe["open"], "latency_ms": probe["latency_ms"]})
+
+def _parse_bulk_probe_request(body) -> tuple[list, int, float]:
+    """Validate a bulk probe body into (probes, concurrency, timeout).
+
+    Raises:
+        ValueError: if the body is malformed or exceeds configured limits
+    """
+    if not isinstance(body, dict):
+        raise ValueError("Expected a JSON object")
+    targets = body.get("targets")
+    if not isinstance(targets, list) or not targets or not all(isinstance(t, str) and t for t in targets):
+        raise ValueError("'targets' must be a non-empty list of hostnames or IPs")
+    ports = body.get("ports", [443])
+    if not isinstance(ports, list) or not ports or \
+            not all(isinstance(p, int) and not isinstance(p, bool) and 0 < p < 65536 for p in ports):
+        raise ValueError("'ports' must be a non-empty list of ports (1-65535)")
+
+    probes = list(dict.fromkeys((t, p) for t in targets for p in ports))
+    if len(probes) > BULK_PROBE_MAX:
+        raise ValueError(f"Too many probes: {len(probes)} (max {BULK_PROBE_MAX})")
     try:
-        with socket.create_connection((target, 443), timeout=3):
-            results["tcp_443"] = True
-            latency = (time.perf_counter() - start_time) * 1000
-            results["latency_ms"] = round(latency, 2)
-    except Exception as e:
-        logger.info(f"Connection failed to {target}: {str(e)}")
-    return jsonify(results)
+        concurrency = int(body.get("concurrency", 100))
+        timeout = float(body.get("timeout", 3))
+    except (TypeError, ValueError):
+        raise ValueError("'concurrency' and 'timeout' must be numbers")
+    concurrency = max(1, min(concurrency, BULK_PROBE_MAX_CONCURRENCY))
+    timeout = max(0.1, min(timeout, BULK_PROBE_MAX_TIMEOUT))
+    return probes, concurrency, timeout
+
+
+# Nginx proxies /api/cnnct/bulk to /cnnct/bulk
+@app.route('/cnnct/bulk', methods=['POST'])
+@limiter.limit("5 per minute")
+def cnnct_bulk():
+    """Probe many targets/ports concurrently; ?stream=1 returns NDJSON as results finish."""
+    try:
+        probes, concurrency, timeout = _parse_bulk_probe_request(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if request.args.get('stream') in ('1', 'true'):
+        def generate():
+            for result in iter_probes(probes, concurrency, timeout):
+                _count_probe("tcp", "open" if result["open"] else "closed")
+                yield json.dumps(result) + "\n"
+        return Response(generate(), mimetype='application/x-ndjson')
+
+    start_time = time.perf_counter()
+    results = run_probes(probes, concurrency, timeout)
+    total = (time.perf_counter() - start_time) * 1000
+    for result in results:
+        _count_probe("tcp", "open" if result["open"] else "closed")
+    return jsonify({
+        "count": len(results),
+        "open": sum(1 for r in results if r["open"]),
+        "concurrency": concurrency,
+        "timeout": timeout,
+        "total_ms": round(total, 2),
+        "results": results,
+    })
 
 # New HTTP Diagnostic Route
 @app.route('/diag', methods=['GET'])
@@ -323,91 +791,251 @@ def diagnose_url():
     if not url.startswith(('http://', 'https://')):
         url = 'https://' + url
 
+    try:
+        max_bytes = min(int(request.args.get('max_bytes', DIAG_MAX_BYTES)), DIAG_MAX_BYTES)
+        max_seconds = min(float(request.args.get('max_seconds', DIAG_MAX_SECONDS)), DIAG_MAX_SECONDS)
+    except ValueError:
+        return jsonify({"error": "max_bytes and max_seconds must be numbers"}), 400
+    if max_bytes < 0 or max_seconds <= 0:
+        return jsonify({"error": "max_bytes must be non-negative and max_seconds positive"}), 400
+
     try:
         start_time = time.perf_counter()
-        response = requests.get(url, timeout=5, allow_redirects=True)
-        total_time = time.perf_counter() - start_time
-        
-        speed_download = len(response.content) / total_time if total_time > 0 else 0
-        
-        remote_ip = "Unknown"
+        response = _diag_session.get(url, timeout=5, allow_redirects=True, stream=True)
+        headers_time = time.perf_counter()
         try:
-            remote_ip = socket.gethostbyname(response.url.split('//')[1].split('/')[0])
-        except Exception as e:
-            logger.info(f"Could not resolve remote IP for {url}: {e}")
+            remote_ip, phases, reused = connection_info(response)
+            body = read_body(response, max_bytes, max_seconds, chunk_size=DIAG_CHUNK_SIZE)
+        finally:
+            response.close()
+        end_time = time.perf_counter()
+        total_time = end_time - start_time
+
+        speed_download = body["bytes"] / total_time if total_time > 0 else 0
+        _count_probe("diag", "success")
+
+        # response.elapsed covers the final hop only (request sent -> headers parsed)
+        hop_ms = response.elapsed.total_seconds() * 1000
+        setup_ms = sum(phases.values()) if phases else 0.0
+        timings = {
+            "dns_ms": phases["dns_ms"] if phases else None,
+            "connect_ms": phases["connect_ms"] if phases else None,
+            "tls_ms": phases["tls_ms"] if phases else None,
+            "ttfb_ms": max(0.0, hop_ms - setup_ms),
+            "transfer_ms": (end_time - headers_time) * 1000,
+            "redirect_ms": max(0.0, (headers_time - start_time) * 1000 - hop_ms),
+        }
 
         return jsonify({
             "url": response.url,
             "http_code": response.status_code,
             "method": request.method,
-            "remote_ip": remote_ip,
+            "remote_ip": remote_ip or "Unknown",
             "total_time_ms": round(total_time * 1000, 2),
             "speed_download_bps": round(speed_download, 2),
+            "size_download": body["bytes"],
+            "truncated": body["truncated"],
+            "stop_reason": body["stop_reason"],
+            "throughput": {k: (round(v, 2) if v is not None else None) for k, v in body["throughput"].items()},
+            "connection_reused": reused,
+            "timings": {k: (round(v, 2) if v is not None else None) for k, v in timings.items()},
             "content_type": response.headers.get('Content-Type', 'unknown'),
             "redirects": len(response.history)
         })
     except Exception as e:
         logger.error(f"HTTP Diag failed for {url}: {str(e)}")
+        _count_probe("diag", "error")
         return jsonify({"error": str(e)}), 400
 
 
+def _webhook_row(result: dict) -> dict:
+    """WebhookEvent column values for a webhook result."""
+    return {
+        "id": uuid.UUID(result["id"]) if result.get("id") else uuid.uuid4(),
+        "timestamp": datetime.fromisoformat(result["timestamp"].replace("Z", "+00:00")),
+        "event_type": result["event_type"],
+        "source_ip": result["source_ip"],
+        "dns_target": result["dns_target"],
+        "dns_records": result["dns_records"],
+        "dns_error": result["dns_error"],
+        "payload": result["payload"],
+    }
+
+
+def _webhook_row_result(row: dict) -> dict:
+    """Webhook result for a row that has not been written to PostgreSQL."""
+    return {
+        "id": str(row["id"]),
+        "timestamp": row["timestamp"].isoformat().replace("+00:00", "Z"),
+        "event_type": row["event_type"],
+        "source_ip": row["source_ip"],
+        "dns_target": row["dns_target"],
+        "dns_records": row["dns_records"] or [],
+        "dns_error": row["dns_error"],
+        "payload": row["payload"] or {},
+    }
+
+
+def _remember_webhook_result(result: dict):
+    """Memory fallback when PostgreSQL is unavailable."""
+    _count_probe("webhook_store", "memory")
+    _webhook_results_memory.append(result)
+
+
+def _on_webhook_flush(rows: list, error: Exception | None):
+    """Count a write-behind batch; keep its rows in memory if the insert failed."""
+    if error is None:
+        metrics.inc("cnnct_probe_total", len(rows), probe="webhook_store", outcome="postgres")
+        _bump_webhook_feed_version()
+        return
+    logger.warning(f"PostgreSQL batch store failed, using memory: {error}")
+    metrics.inc("cnnct_probe_total", len(rows), probe="webhook_store", outcome="postgres_error")
+    for row in rows:
+        _remember_webhook_result(_webhook_row_result(row))
+    _bump_webhook_feed_version()
+
+
 def _store_webhook_result(result: dict):
-    """Store a webhook result in PostgreSQL or memory fallback."""
-    global _webhook_results_memory
+    """Store a webhook result in PostgreSQL or memory fallback.
 
+    The feed version is bumped only once the result is readable by every
+    worker, so no worker caches a feed without it under the new version.
+    Buffered results are bumped by _on_webhook_flush after their batch commits.
+    """
+    _event_broker.publish("webhook", {"status": "processed", **result})
     # Try PostgreSQL first
     if _use_postgres:
-        try:
-            with get_db_session() as session:
-                if session:
-                    event = WebhookEvent(
-                        timestamp=datetime.fromisoformat(result["timestamp"].replace("Z", "+00:00")),
-                        event_type=result["event_type"],
-                        source_ip=result["source_ip"],
-                        dns_target=result["dns_target"],
-                        dns_records=result["dns_records"],
-                        dns_error=result["dns_error"],
-                        payload=result["payload"]
-                    )
-                    session.add(event)
+        if _webhook_writer is not None:
+            if _webhook_writer.add(_webhook_row(result)):
+                return
+            logger.warning("Webhook write buffer full, using memory")
+            _count_probe("webhook_store", "buffer_full")
+        else:
+            try:
+                stored = False
+                with get_db_session() as session:
+                    if session:
+                        session.add(WebhookEvent(**_webhook_row(result)))
+                        stored = True
+                # Counted after the session commits, so a failed commit is not reported as stored
+                if stored:
                     logger.info("Webhook stored in PostgreSQL")
+                    _count_probe("webhook_store", "postgres")
+                    _bump_webhook_feed_version()
                     return
-        except Exception as e:
-            logger.warning(f"PostgreSQL store failed, using memory: {e}")
+            except Exception as e:
+                logger.warning(f"PostgreSQL store failed, using memory: {e}")
+                _count_probe("webhook_store", "postgres_error")
+
+    _remember_webhook_result(result)
+    _bump_webhook_feed_version()
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp; naive values are taken as UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
 
-    # Memory fallback
-    _webhook_results_memory.insert(0, result)
-    _webhook_results_memory = _webhook_results_memory[:WEBHOOK_RESULTS_MAX]
 
+def _encode_cursor(result: dict) -> str:
+    """Opaque page cursor for the (timestamp, id) key of the last result on a page."""
+    raw = f"{result['timestamp']}|{result.get('id') or ''}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
 
-def _get_webhook_results() -> list:
-    """Retrieve webhook results from PostgreSQL or memory fallback."""
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Inverse of _encode_cursor.
+
+    Raises:
+        ValueError: if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except Exception:
+        raise ValueError("Invalid cursor")
+    timestamp, sep, event_id = raw.partition("|")
+    if not sep:
+        raise ValueError("Invalid cursor")
+    if event_id:
+        event_id = str(uuid.UUID(event_id))
+    return _parse_timestamp(timestamp), event_id
+
+
+def _page_webhook_results(results, limit, before=None, event_type=None, since=None, until=None, fields=None):
+    """Filter, order and project in-memory results the same way the SQL query does."""
+    def page_key(r):
+        return _parse_timestamp(r["timestamp"]), r.get("id") or ""
+
+    selected = []
+    for r in results:
+        key = page_key(r)
+        if event_type and r.get("event_type") != event_type:
+            continue
+        if (since and key[0] < since) or (until and key[0] >= until) or (before and key >= before):
+            continue
+        selected.append((key, r))
+    selected.sort(key=lambda item: item[0], reverse=True)
+    if fields is not None:
+        keep = ("id", "timestamp") + tuple(fields)
+        return [{k: r.get(k) for k in keep} for _, r in selected[:limit]]
+    return [r for _, r in selected[:limit]]
+
+
+def _serialize_webhook_columns(row) -> dict:
+    """JSON-ready dict for a Core row of selected webhook_events columns."""
+    result = dict(row)
+    result["id"] = str(result["id"])
+    result["timestamp"] = result["timestamp"].isoformat().replace("+00:00", "Z")
+    if "dns_records" in result:
+        result["dns_records"] = result["dns_records"] or []
+    if "payload" in result:
+        result["payload"] = result["payload"] or {}
+    return result
+
+
+def _get_webhook_results(limit: int = WEBHOOK_RESULTS_MAX, before: tuple | None = None,
+                         event_type: str | None = None, since: datetime | None = None,
+                         until: datetime | None = None, fields: tuple | None = None) -> list:
+    """Retrieve webhook results from PostgreSQL or memory fallback, newest first.
+
+    Pages are keyed on (timestamp, id): `before` is the key of the last
+    result of the previous page. Only the columns in `fields` (plus id and
+    timestamp) are selected, as Core rows rather than ORM entities.
+    """
+    page = {"before": before, "event_type": event_type, "since": since, "until": until, "fields": fields}
     # Try PostgreSQL first
     if _use_postgres:
         try:
             with get_db_session() as session:
                 if session:
-                    events = session.query(WebhookEvent)\
-                        .order_by(WebhookEvent.timestamp.desc())\
-                        .limit(WEBHOOK_RESULTS_MAX)\
-                        .all()
-                    return [
-                        {
-                            "id": str(e.id),
-                            "timestamp": e.timestamp.isoformat().replace("+00:00", "Z"),
-                            "event_type": e.event_type,
-                            "source_ip": e.source_ip,
-                            "dns_target": e.dns_target,
-                            "dns_records": e.dns_records or [],
-                            "dns_error": e.dns_error,
-                            "payload": e.payload or {}
-                        }
-                        for e in events
-                    ]
+                    names = ("id", "timestamp") + tuple(f for f in (fields or WEBHOOK_RESULT_FIELDS)
+                                                        if f not in ("id", "timestamp"))
+                    stmt = select(*(getattr(WebhookEvent, name) for name in names))\
+                        .order_by(WebhookEvent.timestamp.desc(), WebhookEvent.id.desc())\
+                        .limit(limit)
+                    if event_type:
+                        stmt = stmt.where(WebhookEvent.event_type == event_type)
+                    if since:
+                        stmt = stmt.where(WebhookEvent.timestamp >= since)
+                    if until:
+                        stmt = stmt.where(WebhookEvent.timestamp < until)
+                    if before and before[1]:
+                        stmt = stmt.where(tuple_(WebhookEvent.timestamp, WebhookEvent.id) <
+                                          tuple_(before[0], uuid.UUID(before[1])))
+                    elif before:
+                        stmt = stmt.where(WebhookEvent.timestamp < before[0])
+                    stored = [_serialize_webhook_columns(row) for row in session.execute(stmt).mappings().all()]
+                    # Rows still in the write-behind buffer are not committed yet but belong on the page
+                    buffered = [_webhook_row_result(row) for row in _webhook_writer.buffered()] \
+                        if _webhook_writer is not None else []
+                    if not buffered:
+                        return stored
+                    return _page_webhook_results(stored + _page_webhook_results(buffered, limit, **page),
+                                                 limit)
         except Exception as e:
             logger.warning(f"PostgreSQL fetch failed, using memory: {e}")
 
-    return _webhook_results_memory
+    return _page_webhook_results(_webhook_results_memory.items(), limit, **page)
 
 
 @app.route('/webhook-receive/<secret>', methods=['POST'])
@@ -422,55 +1050,158 @@ def receive_webhook(secret):
         return jsonify({"error": "Invalid secret"}), 403
 
     # Parse incoming webhook payload (Pomofocus format: type, round, task, seconds, etc.)
-    payload = request.get_json() or {}
+    payload = request.get_json(silent=True)
+    if payload is None and request.get_data():
+        return jsonify({"error": "Payload must be JSON"}), 400
+    payload = payload or {}
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Payload must be a JSON object"}), 400
     event_type = payload.get("type") or payload.get("event") or "unknown"
 
-    # Perform DNS lookup on configured target
-    dns_records, dns_error = _resolve_dns(webhook_dns_target)
-
-    # Build result entry
-    result_entry = {
+    # The id travels through the queue and becomes the stored row's id, so
+    # the event_id returned here matches both the pending and processed result
+    entry = {
+        "id": str(uuid.uuid4()),
         "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         "event_type": event_type,
         "source_ip": get_remote_address(),
-        "dns_target": webhook_dns_target,
-        "dns_records": dns_records,
-        "dns_error": dns_error,
         "payload": payload
     }
 
-    _store_webhook_result(result_entry)
-    logger.info(f"Webhook received: event={event_type}, dns_records={dns_records}")
+    if _webhook_queue is not None:
+        try:
+            event_id = _webhook_queue.enqueue(entry)
+        except queue.Full:
+            return jsonify({"error": "Webhook queue is full, retry later"}), 503
+        return jsonify({"status": "queued", "event_id": event_id, "dns_target": webhook_dns_target}), 202
+
+    dns_cache_info = {}
+    result_entry = _process_webhook(entry, dns_cache_info)
 
     return jsonify({
         "status": "received",
+        "event_id": result_entry["id"],
         "dns_target": webhook_dns_target,
-        "dns_records": dns_records,
-        "dns_error": dns_error
+        "dns_records": result_entry["dns_records"],
+        "dns_error": result_entry["dns_error"],
+        "dns_cache": dns_cache_info
     })
 
 
+def _process_webhook(entry: dict, dns_cache_info: dict | None = None) -> dict:
+    """Resolve the configured DNS target for a received webhook and store the result."""
+    dns_records, dns_error = _resolve_dns(webhook_dns_target, cache_info=dns_cache_info)
+    result_entry = {
+        **entry,
+        "dns_target": webhook_dns_target,
+        "dns_records": dns_records,
+        "dns_error": dns_error,
+    }
+    _store_webhook_result(result_entry)
+    logger.info(f"Webhook received: event={entry['event_type']}, dns_records={dns_records}")
+    return result_entry
+
+
 @app.route('/webhook-results', methods=['GET'])
 @limiter.limit("10 per minute")
 def get_webhook_results():
-    """Retrieve stored webhook results."""
-    results = _get_webhook_results()
+    """Retrieve stored webhook results, plus queued events not yet processed.
+
+    Supports keyset pagination (?limit=, ?before=<next_cursor>), filters
+    (?event_type=, ?since=, ?until=) and projection (?fields=a,b).
+    """
+    try:
+        limit = int(request.args.get('limit', WEBHOOK_RESULTS_MAX))
+        before = _decode_cursor(request.args['before']) if request.args.get('before') else None
+        since = _parse_timestamp(request.args['since']) if request.args.get('since') else None
+        until = _parse_timestamp(request.args['until']) if request.args.get('until') else None
+    except ValueError:
+        return jsonify({"error": "limit must be an integer, before a cursor from next_cursor, "
+                                 "since/until ISO-8601 timestamps"}), 400
+    if not 1 <= limit <= WEBHOOK_RESULTS_PAGE_MAX:
+        return jsonify({"error": f"limit must be 1-{WEBHOOK_RESULTS_PAGE_MAX}"}), 400
+    fields = None
+    if request.args.get('fields'):
+        fields = tuple(dict.fromkeys(f.strip() for f in request.args['fields'].split(',') if f.strip()))
+        unknown = [f for f in fields if f not in WEBHOOK_RESULT_FIELDS]
+        if unknown:
+            return jsonify({"error": f"Unknown fields: {', '.join(unknown)}",
+                            "supported": list(WEBHOOK_RESULT_FIELDS)}), 400
+
+    results = [{"status": "processed", **r} for r in _get_webhook_results(
+        limit, before=before, event_type=request.args.get('event_type'), since=since, until=until, fields=fields,
+    )]
+    pending, queue_stats = [], None
+    # Pending events are newer than anything stored, so they only belong on the first page
+    if _webhook_queue is not None:
+        pending = [] if before else _webhook_queue.pending(limit)
+        queue_stats = _webhook_queue.stats()
     return jsonify({
         "count": len(results),
-        "results": results
+        "results": results,
+        "next_cursor": _encode_cursor(results[-1]) if len(results) == limit else None,
+        "pending_count": len(pending),
+        "pending": pending,
+        "queue": queue_stats
     })
 
 
-@app.route('/webhook-results/rss', methods=['GET'])
-@limiter.limit("10 per minute")
-def get_webhook_results_rss():
-    """Retrieve stored webhook results as RSS feed."""
-    results = _get_webhook_results()
+# Rendered RSS feed, rebuilt only when the webhook feed version changes
+RSS_ITEMS = 20
+RSS_CACHE_TTL = float(os.environ.get("RSS_CACHE_TTL", 30))
+WEBHOOK_FEED_VERSION_KEY = "cnnct:webhooks:feed-version"
+_rss_cache = None
+_rss_cache_lock = threading.Lock()
+_webhook_feed_version_local = 0
+_webhook_feed_version_lock = threading.Lock()
 
-    # Build RSS 2.0 XML
-    base_url = request.url_root.rstrip('/')
-    items_xml = ""
-    for r in results[:20]:  # Limit to 20 items for RSS
+
+def _bump_webhook_feed_version():
+    """Mark cached feeds stale; shared through Valkey so every worker sees it."""
+    global _webhook_feed_version_local
+    with _webhook_feed_version_lock:
+        _webhook_feed_version_local += 1
+    if redis_url == "memory://":
+        return
+    try:
+        _get_valkey_client().incr(WEBHOOK_FEED_VERSION_KEY)
+    except Exception as e:
+        logger.warning(f"Feed version bump failed: {e}")
+
+
+def _webhook_feed_version():
+    """Current feed version; falls back to this worker's counter without Valkey.
+
+    The local counter only sees this worker's writes, which is why cached
+    feeds also expire after RSS_CACHE_TTL seconds.
+    """
+    if redis_url == "memory://":
+        return _webhook_feed_version_local
+    try:
+        return int(_get_valkey_client().get(WEBHOOK_FEED_VERSION_KEY) or 0)
+    except Exception as e:
+        logger.warning(f"Feed version read failed: {e}")
+        return _webhook_feed_version_local
+
+
+def _render_rss(results: list, base_url: str, last_build: datetime) -> bytes:
+    """Serialize an RSS 2.0 document in one pass with a streaming XML writer."""
+    out = io.BytesIO()
+    xml = XMLGenerator(out, encoding="UTF-8", short_empty_elements=True)
+
+    def element(name, text):
+        xml.startElement(name, {})
+        xml.characters(text)
+        xml.endElement(name)
+
+    xml.startDocument()
+    xml.startElement("rss", {"version": "2.0"})
+    xml.startElement("channel", {})
+    element("title", "CNNCT Webhook Events")
+    element("link", base_url)
+    element("description", "Recent webhook events received by CNNCT")
+    element("lastBuildDate", last_build.strftime("%a, %d %b %Y %H:%M:%S +0000"))
+    for r in results:
         payload = r.get("payload", {})
         task = payload.get("task", "(no task)")
         round_type = payload.get("round", "unknown")
@@ -479,36 +1210,77 @@ def get_webhook_results_rss():
 
         # Format pub date for RSS (RFC 822)
         try:
-            dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-            pub_date = dt.strftime("%a, %d %b %Y %H:%M:%S +0000")
+            pub_date = _parse_timestamp(timestamp).strftime("%a, %d %b %Y %H:%M:%S +0000")
         except (ValueError, AttributeError):
             pub_date = timestamp
 
-        title = f"{round_type.replace('_', ' ').title()}: {task}"
         description = f"Event: {event_type}, Round: {round_type}"
         if payload.get("seconds"):
             description += f", Duration: {payload['seconds'] // 60}m"
 
-        items_xml += f"""
-        <item>
-            <title><![CDATA[{title}]]></title>
-            <description><![CDATA[{description}]]></description>
-            <pubDate>{pub_date}</pubDate>
-            <guid isPermaLink="false">{r.get('id', timestamp)}</guid>
-        </item>"""
+        xml.startElement("item", {})
+        element("title", f"{round_type.replace('_', ' ').title()}: {task}")
+        element("description", description)
+        element("pubDate", pub_date)
+        xml.startElement("guid", {"isPermaLink": "false"})
+        xml.characters(str(r.get("id") or timestamp))
+        xml.endElement("guid")
+        xml.endElement("item")
+    xml.endElement("channel")
+    xml.endElement("rss")
+    xml.endDocument()
+    return out.getvalue()
+
+
+def _build_rss_feed(version, base_url: str) -> dict:
+    results = _get_webhook_results(RSS_ITEMS)
+    newest = results[0] if results else {}
+    try:
+        last_modified = _parse_timestamp(newest["timestamp"])
+    except (KeyError, ValueError):
+        last_modified = datetime.fromtimestamp(_app_start_time, tz=timezone.utc)
+    # The ETag follows the newest event, so a rebuild with the same items still matches
+    key = f"{newest.get('id')}|{newest.get('timestamp')}|{len(results)}|{base_url}"
+    return {
+        "version": version,
+        "base_url": base_url,
+        "built_at": time.monotonic(),
+        "etag": hashlib.sha256(key.encode()).hexdigest()[:32],
+        "last_modified": last_modified,
+        "body": _render_rss(results, base_url, last_modified),
+    }
+
+
+@app.route('/webhook-results/rss', methods=['GET'])
+@limiter.limit("10 per minute")
+def get_webhook_results_rss():
+    """Retrieve stored webhook results as RSS feed.
+
+    The rendered feed is cached until a webhook is stored (or RSS_CACHE_TTL
+    passes), and requests with a matching If-None-Match/If-Modified-Since
+    get a 304 without touching the database.
+    """
+    global _rss_cache
+    base_url = request.url_root.rstrip('/')
+    version = _webhook_feed_version()
+    with _rss_cache_lock:
+        feed = _rss_cache
+        if feed is None or feed["version"] != version or feed["base_url"] != base_url \
+                or time.monotonic() - feed["built_at"] > RSS_CACHE_TTL:
+            feed = _rss_cache = _build_rss_feed(version, base_url)
 
-    rss_xml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<rss version="2.0">
-    <channel>
-        <title>CNNCT Webhook Events</title>
-        <link>{base_url}</link>
-        <description>Recent webhook events received by CNNCT</description>
-        <lastBuildDate>{datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000")}</lastBuildDate>
-        {items_xml}
-    </channel>
-</rss>"""
+    response = Response(feed["body"], mimetype='application/rss+xml')
+    response.set_etag(feed["etag"])
+    response.last_modified = feed["last_modified"]
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
-    return Response(rss_xml, mimetype='application/rss+xml')
+
+@app.route('/metrics', methods=['GET'])
+@limiter.exempt
+def prometheus_metrics():
+    """Serve request and probe metrics in Prometheus text format."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 
 @app.route('/status', methods=['GET'])
@@ -519,6 +1291,22 @@ def redis_status():
     return jsonify(data), status_code
 
 
+def _estimate_webhook_events(session) -> int:
+    """Live-row estimate for webhook_events from the statistics collector.
+
+    Sums n_live_tup over the table and its partitions, which PostgreSQL
+    keeps up to date as transactions commit, so the cost depends on the
+    number of partitions rather than rows. Unlike COUNT(*) it can lag
+    slightly and restarts from the last ANALYZE after a stats reset.
+    """
+    from sqlalchemy import text
+    return session.execute(text(
+        "SELECT COALESCE(sum(n_live_tup), 0)::bigint FROM pg_stat_user_tables "
+        "WHERE relid = to_regclass('webhook_events') "
+        "OR relid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass('webhook_events'))"
+    )).scalar()
+
+
 @app.route('/db-status', methods=['GET'])
 @limiter.limit("5 per minute")
 def db_status():
@@ -527,10 +1315,13 @@ def db_status():
 
     # Augment with webhook event count when connected (preserves original shape)
     if data.get("connected") and _use_postgres:
+        exact = request.args.get('exact') in ('1', 'true')
         try:
             with get_db_session() as session:
                 if session:
-                    data["webhook_events_count"] = session.query(WebhookEvent).count()
+                    data["webhook_events_count"] = session.query(WebhookEvent).count() if exact \
+                        else _estimate_webhook_events(session)
+                    data["webhook_events_count_exact"] = exact
         except Exception:  # nosec B110 — best-effort count, non-critical
             pass
 
@@ -541,39 +1332,136 @@ def db_status():
 @app.route('/health', methods=['GET'])
 @limiter.limit("5 per minute")
 def health():
-    """Consolidated health endpoint for all backend services."""
-    # DNS canary
-    dns_start = time.perf_counter()
-    dns_records, dns_error = _resolve_dns(_canary_domain)
-    dns_latency = (time.perf_counter() - dns_start) * 1000
+    """Consolidated health endpoint for all backend services.
+
+    Served from the background snapshot when enabled; `?fresh=1` forces a
+    live check.
+    """
+    fresh = request.args.get('fresh') in ('1', 'true')
+    if _health_snapshot is not None and not fresh:
+        snapshot, age = _health_snapshot.get()
+        if snapshot is not None:
+            return jsonify({"app": _app_info(), **snapshot, "age_seconds": round(age, 2)})
+
+    snapshot = _refresh_health_snapshot()
+    if _health_snapshot is not None:
+        _health_snapshot.set(snapshot)
+    return jsonify({"app": _app_info(), **snapshot, "age_seconds": 0})
+
+
+def _app_info() -> dict:
+    return {
+        "git_sha": _github_sha,
+        "uptime_seconds": round(time.time() - _app_start_time),
+        "python_version": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
+    }
+
 
-    # Rate limiter info
+def _build_health_snapshot() -> dict:
+    """Run all backend checks concurrently and build the /health body (minus `app`)."""
+    results = _run_health_checks({
+        "valkey": _check_valkey_health,
+        "postgres": _check_postgres_health,
+        "opensearch": _check_opensearch_health,
+        "dns_canary": _check_dns_canary,
+    }, HEALTH_CHECK_DEADLINE)
+
+    dns_canary = results["dns_canary"]
+    if "domain" not in dns_canary:
+        # Timed out or raised: keep the canary's usual fields
+        dns_canary = {"domain": _canary_domain, "ok": False, "records": [], "latency_ms": None,
+                      "cache_hit": False, "ttl_remaining": 0, **dns_canary}
+        dns_canary.pop("connected", None)
+
+    # Rate limiter info (reuses the single Valkey check above)
     rate_backend = "memory" if redis_url == "memory://" else "redis"
-    in_memory_fallback = rate_backend == "redis" and not _check_valkey_health().get("connected", False)
+    in_memory_fallback = rate_backend == "redis" and not results["valkey"].get("connected", False)
 
-    return jsonify({
-        "app": {
-            "git_sha": _github_sha,
-            "uptime_seconds": round(time.time() - _app_start_time),
-            "python_version": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
-        },
-        "valkey": _check_valkey_health(),
-        "postgres": _check_postgres_health(),
-        "opensearch": _check_opensearch_health(),
-        "dns_canary": {
-            "domain": _canary_domain,
-            "ok": len(dns_records) > 0,
-            "records": dns_records,
-            "latency_ms": round(dns_latency, 2),
-            "error": dns_error,
-        },
+    return {
+        "valkey": results["valkey"],
+        "postgres": results["postgres"],
+        "opensearch": results["opensearch"],
+        "dns_canary": dns_canary,
         "rate_limiter": {
             "backend": rate_backend,
             "in_memory_fallback": in_memory_fallback,
         },
-    })
+    }
 
 
+def _health_status(snapshot: dict) -> dict:
+    """The parts of a health snapshot that count as a status change (no latencies)."""
+    return {
+        "valkey": snapshot["valkey"].get("connected"),
+        "postgres": snapshot["postgres"].get("connected"),
+        "opensearch": snapshot["opensearch"].get("status"),
+        "dns_canary": snapshot["dns_canary"].get("ok"),
+        "rate_limiter": snapshot["rate_limiter"].get("in_memory_fallback"),
+    }
+
+
+def _refresh_health_snapshot() -> dict:
+    """Build a snapshot and push it to /events subscribers if any status changed."""
+    snapshot = _build_health_snapshot()
+    if _event_broker.changed("health", _health_status(snapshot)):
+        _event_broker.publish("health", {"app": _app_info(), **snapshot, "age_seconds": 0})
+    return snapshot
+
+
+@app.route('/events', methods=['GET'])
+@limiter.exempt
+def event_stream():
+    """Server-sent events: `webhook` for each stored webhook, `health` on status changes.
+
+    A `ready` event opens the stream. Its `health_push` is false without the
+    background snapshot: health changes are then only pushed when some caller
+    runs a live /health check, so clients should keep polling /health. With
+    the snapshot, its current value follows as the first `health` event.
+    """
+    client = _event_broker.subscribe()
+    if client is None:
+        return jsonify({"error": "Too many event stream clients, poll instead"}), 503
+    initial = [("ready", {"health_push": _health_snapshot is not None})]
+    if _health_snapshot is not None:
+        snapshot, age = _health_snapshot.get()
+        if snapshot is not None:
+            initial.append(("health", {"app": _app_info(), **snapshot, "age_seconds": round(age, 2)}))
+    response = Response(_event_broker.stream(client, initial), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # let nginx pass frames through unbuffered
+    return response
+
+
+# Background health snapshot; disabled (live checks per request) unless an interval is set
+_health_snapshot = None
+_health_snapshot_interval = float(os.environ.get("HEALTH_SNAPSHOT_INTERVAL", 0))
+if _health_snapshot_interval > 0:
+    try:
+        from health_snapshot import HealthSnapshot
+    except ImportError:
+        from src.health_snapshot import HealthSnapshot
+    _health_snapshot = HealthSnapshot(
+        _refresh_health_snapshot,
+        interval=_health_snapshot_interval,
+        redis_url=redis_url,
+    )
+
+
+# WEBHOOK_INGEST_MODE=queued replies 202 right away and leaves DNS lookup and
+# storage to background workers fed from a Valkey stream (memory fallback)
+_webhook_queue = None
+if os.environ.get("WEBHOOK_INGEST_MODE", "sync") == "queued":
+    try:
+        from webhook_queue import WebhookQueue
+    except ImportError:
+        from src.webhook_queue import WebhookQueue
+    _webhook_queue = WebhookQueue(
+        _process_webhook,
+        redis_url=os.environ.get("WEBHOOK_QUEUE_URL", redis_url),
+        workers=int(os.environ.get("WEBHOOK_WORKERS", 4)),
+        max_pending=int(os.environ.get("WEBHOOK_QUEUE_MAX", 10000)),
+    )
+
 _timer_interval = os.environ.get("WEBHOOK_TIMER_INTERVAL")
 if _timer_interval and webhook_secret:
     try:
@@ -0,0 +1,115 @@
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+class DNSCache:
+    """TTL-aware LRU cache for DNS answers, optionally shared through Valkey.
+
+    Entries are keyed on (domain, record type) and expire when the upstream
+    answer's TTL runs out. Negative answers (NXDOMAIN/NoAnswer) are cached for
+    `negative_ttl` seconds. The local tier is an LRU capped at `max_entries`;
+    when `redis_url` points at Valkey/Redis, entries are also written there
+    with a matching expiry so every Gunicorn worker sees the same answers.
+    Valkey failures are non-fatal and fall back to the local tier.
+    """
+
+    KEY_PREFIX = "cnnct:dns:"
+
+    def __init__(self, max_entries=1024, max_ttl=300, negative_ttl=30, redis_url=None):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._max_ttl = max_ttl
+        self._negative_ttl = negative_ttl
+        self._redis = None
+
+        if redis_url and redis_url != "memory://" and max_entries > 0:
+            try:
+                import redis
+                self._redis = redis.from_url(redis_url, socket_connect_timeout=1, socket_timeout=1)
+            except Exception as e:
+                print(f"[DNSCache] Valkey backend unavailable, using local cache: {e}", file=sys.stderr)
+
+    @property
+    def enabled(self):
+        return self._max_entries > 0
+
+    def get(self, domain, rdtype):
+        """Return (records, error, ttl_remaining) for a cached answer, or None."""
+        if not self.enabled:
+            return None
+        key = self._key(domain, rdtype)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[2] > now:
+                    self._entries.move_to_end(key)
+                    return entry[0], entry[1], int(entry[2] - now)
+                del self._entries[key]
+
+        shared = self._get_shared(key)
+        if shared is None:
+            return None
+        records, error, expires_at = shared
+        if expires_at <= now:
+            return None
+        self._store_local(key, records, error, expires_at)
+        return records, error, int(expires_at - now)
+
+    def set(self, domain, rdtype, records, error=None, ttl=0):
+        """Cache an answer and return the TTL it was stored with (0 if not cached).
+
+        A falsy `error` means a positive answer valid for `ttl` seconds; negative
+        answers use the configured `negative_ttl` instead.
+        """
+        if not self.enabled:
+            return 0
+        ttl = self._negative_ttl if error else min(ttl, self._max_ttl)
+        if ttl <= 0:
+            return 0
+        key = self._key(domain, rdtype)
+        expires_at = time.time() + ttl
+        self._store_local(key, records, error, expires_at)
+        if self._redis is not None:
+            try:
+                value = json.dumps({"records": records, "error": error, "expires_at": expires_at})
+                self._redis.set(self.KEY_PREFIX + key, value, ex=max(1, int(ttl)))
+            except Exception as e:
+                print(f"[DNSCache] Valkey write failed: {e}", file=sys.stderr)
+        return int(ttl)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _store_local(self, key, records, error, expires_at):
+        with self._lock:
+            self._entries[key] = (records, error, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_shared(self, key):
+        if self._redis is None:
+            return None
+        try:
+            raw = self._redis.get(self.KEY_PREFIX + key)
+            if raw is None:
+                return None
+            data = json.loads(raw)
+            return data["records"], data["error"], data["expires_at"]
+        except Exception as e:
+            print(f"[DNSCache] Valkey read failed: {e}", file=sys.stderr)
+            return None
+
+    @staticmethod
+    def _key(domain, rdtype):
+        return f"{domain.rstrip('.').lower()}|{rdtype.upper()}"
@@ -0,0 +1,130 @@
+import json
+import queue
+import sys
+import threading
+import time
+
+
+class EventBroker:
+    """Fans out server-sent events to every connected client in every worker.
+
+    `publish()` sends an event over one Valkey pub/sub channel. Each process
+    runs a single subscriber thread that copies incoming events into the
+    small per-client queues returned by `subscribe()`, so an idle client costs
+    one blocked thread and one queue, never a backend query. Without Valkey,
+    events only reach clients of the publishing process.
+    """
+
+    CHANNEL = "cnnct:events"
+    STATE_KEY_PREFIX = "cnnct:events:last:"
+    CLIENT_QUEUE_SIZE = 100
+
+    def __init__(self, redis_url=None, max_clients=32):
+        self._max_clients = max_clients
+        self._clients = set()
+        self._lock = threading.Lock()
+        self._last_state = {}
+        self._redis = None
+
+        if redis_url and redis_url != "memory://":
+            try:
+                import redis
+                self._redis = redis.from_url(redis_url, socket_connect_timeout=2, socket_timeout=2)
+                # The subscriber blocks on reads indefinitely, so it gets its own client without a read timeout
+                self._subscriber = redis.from_url(redis_url, socket_connect_timeout=2, health_check_interval=30)
+            except Exception as e:
+                print(f"[EventBroker] Valkey unavailable, events stay in this worker: {e}", file=sys.stderr)
+        if self._redis is not None:
+            self._thread = threading.Thread(target=self._listen, name="event-broker", daemon=True)
+            self._thread.start()
+
+    @property
+    def client_count(self):
+        return len(self._clients)
+
+    def subscribe(self):
+        """Register a client; returns its queue, or None if max_clients are connected."""
+        client = queue.Queue(maxsize=self.CLIENT_QUEUE_SIZE)
+        with self._lock:
+            if len(self._clients) >= self._max_clients:
+                return None
+            self._clients.add(client)
+        return client
+
+    def unsubscribe(self, client):
+        with self._lock:
+            self._clients.discard(client)
+
+    def publish(self, event, data):
+        message = json.dumps({"event": event, "data": data}, default=str)
+        if self._redis is not None:
+            try:
+                self._redis.publish(self.CHANNEL, message)
+                return
+            except Exception as e:
+                print(f"[EventBroker] Publish failed, delivering locally: {e}", file=sys.stderr)
+        self._deliver(message)
+
+    def changed(self, name, state):
+        """Record `state` under `name`; True if it differs from the last recorded state.
+
+        Uses an atomic GETSET in Valkey so only one worker sees each change.
+        """
+        encoded = json.dumps(state, sort_keys=True, default=str)
+        if self._redis is not None:
+            try:
+                previous = self._redis.getset(self.STATE_KEY_PREFIX + name, encoded)
+                return previous is None or previous.decode() != encoded
+            except Exception as e:
+                print(f"[EventBroker] State check failed: {e}", file=sys.stderr)
+        with self._lock:
+            previous, self._last_state[name] = self._last_state.get(name), encoded
+        return previous != encoded
+
+    def stream(self, client, initial=(), keepalive=15.0):
+        """Yield SSE frames for a subscribed client until it disconnects."""
+        try:
+            yield "retry: 5000\n\n"
+            for event, data in initial:
+                yield _frame(event, json.dumps(data, default=str))
+            while True:
+                try:
+                    yield client.get(timeout=keepalive)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+        finally:
+            self.unsubscribe(client)
+
+    def _deliver(self, message):
+        # Format the frame once; every client queue gets the same string
+        payload = json.loads(message)
+        frame = _frame(payload["event"], json.dumps(payload["data"]))
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            try:
+                client.put_nowait(frame)
+            except queue.Full:
+                # Slow reader: drop its oldest event rather than block everyone else
+                try:
+                    client.get_nowait()
+                    client.put_nowait(frame)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._subscriber.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.CHANNEL)
+                for item in pubsub.listen():
+                    if item.get("type") == "message":
+                        data = item["data"]
+                        self._deliver(data.decode() if isinstance(data, bytes) else data)
+            except Exception as e:
+                print(f"[EventBroker] Subscription lost, retrying: {e}", file=sys.stderr)
+                time.sleep(1)
+
+
+def _frame(event, data):
+    return f"event: {event}\ndata: {data}\n\n"
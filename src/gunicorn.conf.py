@@ -0,0 +1,30 @@
+"""Gunicorn settings for the backend container.
+
+Probe endpoints spend nearly all their time waiting on the network. The
+threaded worker lets each process keep many requests in flight, while TCP
+connects for /cnnct run on a shared asyncio loop (see aio.py) instead of
+holding a blocking socket per request.
+"""
+import os
+
+# Bandit B104: binding to 0.0.0.0 is required for container networking
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 8080)}"  # nosec B104
+workers = int(os.environ.get("GUNICORN_WORKERS", 2))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 64))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+keepalive = 5
+
+# Per-worker metric files (see metrics.py); cleared on start so counters reset with the server
+os.environ.setdefault("METRICS_DIR", "/tmp/cnnct-metrics")  # nosec B108 - container-local scratch dir
+# Ring buffer file shared by workers for webhook results when neither PostgreSQL nor Valkey is up (see result_ring.py)
+os.environ.setdefault("WEBHOOK_MEMORY_PATH", "/tmp/cnnct-webhooks.ring")  # nosec B108 - container-local scratch file
+
+
+def on_starting(server):
+    import shutil
+    shutil.rmtree(os.environ["METRICS_DIR"], ignore_errors=True)
+    try:
+        os.remove(os.environ["WEBHOOK_MEMORY_PATH"])
+    except FileNotFoundError:
+        pass
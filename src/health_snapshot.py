@@ -0,0 +1,108 @@
+import json
+import os
+import sys
+import threading
+import time
+
+
+class HealthSnapshot:
+    """Background-refreshed health snapshot served from memory.
+
+    A daemon thread calls `compute` every `interval` seconds and keeps the
+    result in process memory, so readers never touch the backends. With
+    Valkey configured, workers take turns via a short-lived lock key: the
+    worker that wins computes and publishes the snapshot, the others copy
+    the published one, so backend load stays at one check per interval no
+    matter how many workers or dashboards there are.
+    """
+
+    KEY = "cnnct:health:snapshot"
+    LOCK_KEY = "cnnct:health:refresh-lock"
+
+    def __init__(self, compute, interval, redis_url=None):
+        self._compute = compute
+        self._interval = interval
+        self._snapshot = None
+        self._generated_at = None
+        self._lock = threading.Lock()
+        self._redis = None
+        self._closed = False
+
+        if redis_url and redis_url != "memory://":
+            try:
+                import redis
+                self._redis = redis.from_url(redis_url, socket_connect_timeout=2, socket_timeout=2)
+            except Exception as e:
+                print(f"[HealthSnapshot] Valkey unavailable, refreshing per worker: {e}", file=sys.stderr)
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def get(self):
+        """Return (snapshot, age_seconds), or (None, None) if none is usable.
+
+        Snapshots older than three intervals are treated as missing so a
+        stalled refresher falls back to live checks instead of stale data.
+        """
+        with self._lock:
+            snapshot, generated_at = self._snapshot, self._generated_at
+        if snapshot is None:
+            return None, None
+        age = time.time() - generated_at
+        if age > self._interval * 3:
+            return None, None
+        return snapshot, age
+
+    def set(self, snapshot, generated_at=None):
+        with self._lock:
+            self._snapshot = snapshot
+            self._generated_at = generated_at if generated_at is not None else time.time()
+
+    def refresh(self):
+        """Compute (or adopt another worker's) snapshot once."""
+        try:
+            if self._redis is not None and not self._claim_refresh() and self._pull_shared():
+                return
+            snapshot = self._compute()
+            generated_at = time.time()
+            self.set(snapshot, generated_at)
+            self._push_shared(snapshot, generated_at)
+        except Exception as e:
+            print(f"[HealthSnapshot] Refresh failed: {e}", file=sys.stderr)
+
+    def close(self):
+        self._closed = True
+
+    def _run(self):
+        while not self._closed:
+            self.refresh()
+            time.sleep(self._interval)
+
+    def _claim_refresh(self):
+        try:
+            ttl = max(1, int(self._interval))
+            return bool(self._redis.set(self.LOCK_KEY, os.getpid(), nx=True, ex=ttl))
+        except Exception as e:
+            print(f"[HealthSnapshot] Lock failed: {e}", file=sys.stderr)
+            return True
+
+    def _pull_shared(self):
+        try:
+            raw = self._redis.get(self.KEY)
+        except Exception as e:
+            print(f"[HealthSnapshot] Valkey read failed: {e}", file=sys.stderr)
+            return False
+        if raw is None:
+            return False
+        data = json.loads(raw)
+        self.set(data["snapshot"], data["generated_at"])
+        return True
+
+    def _push_shared(self, snapshot, generated_at):
+        if self._redis is None:
+            return
+        try:
+            value = json.dumps({"snapshot": snapshot, "generated_at": generated_at}, default=str)
+            self._redis.set(self.KEY, value, ex=max(1, int(self._interval * 3)))
+        except Exception as e:
+            print(f"[HealthSnapshot] Valkey write failed: {e}", file=sys.stderr)
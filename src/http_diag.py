@@ -0,0 +1,233 @@
+"""Pooled HTTP transport that records per-connection phase timings for /diag."""
+import socket
+import time
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+
+class _PhaseTimingMixin:
+    """Splits connection setup into DNS, TCP connect and TLS handshake times.
+
+    `phase_timings` is set when the connection is (re)established and
+    `fresh` stays True until a caller consumes the timings, so a request
+    served on a kept-alive connection can be reported as reused.
+    """
+
+    phase_timings = None
+    fresh = False
+
+    def _new_conn(self):
+        dns_start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)
+        except socket.gaierror:
+            # Let urllib3 raise its usual NameResolutionError
+            return super()._new_conn()
+        dns_end = time.perf_counter()
+
+        # Try each address in turn, as socket.create_connection would; connect_ms
+        # covers only the attempt that succeeded
+        hostname = self._dns_host
+        error = None
+        try:
+            for info in infos:
+                self._dns_host = info[4][0]
+                connect_start = time.perf_counter()
+                try:
+                    sock = super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError) as e:
+                    error = e
+                    continue
+                self.phase_timings = {
+                    "dns_ms": (dns_end - dns_start) * 1000,
+                    "connect_ms": (time.perf_counter() - connect_start) * 1000,
+                    "tls_ms": 0.0,
+                }
+                return sock
+        finally:
+            self._dns_host = hostname
+        raise error
+
+    def connect(self):
+        start_time = time.perf_counter()
+        super().connect()
+        if self.phase_timings is not None:
+            elapsed = (time.perf_counter() - start_time) * 1000
+            setup = self.phase_timings["dns_ms"] + self.phase_timings["connect_ms"]
+            if isinstance(self, HTTPSConnection):
+                self.phase_timings["tls_ms"] = max(0.0, elapsed - setup)
+        self.fresh = True
+
+
+class TimedHTTPConnection(_PhaseTimingMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_PhaseTimingMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class PhaseTimingAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections record phase timings."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def create_session(pool_hosts=10, pool_size=10):
+    """Build a keep-alive session whose connections report phase timings.
+
+    The session is shared by every /diag caller, so it only pools connections:
+    its cookie jar rejects all cookies so one caller's target state never
+    reaches another's request.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = PhaseTimingAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def connection_info(response):
+    """Return (peer_ip, phase_timings, reused) for a streamed response.
+
+    Must be called before the body is consumed, while the connection is
+    still attached to the response. Fields are None when the transport
+    does not expose a socket (e.g. mocked adapters).
+    """
+    conn = getattr(response.raw, "connection", None)
+    sock = getattr(conn, "sock", None)
+    peer_ip = None
+    if sock is not None:
+        try:
+            peer_ip = sock.getpeername()[0]
+        except OSError:
+            pass
+    timings = getattr(conn, "phase_timings", None)
+    fresh = getattr(conn, "fresh", False)
+    if conn is not None and fresh:
+        conn.fresh = False
+    if timings is None or not fresh:
+        return peer_ip, None, conn is not None
+    return peer_ip, dict(timings), False
+
+
+class ThroughputMeter:
+    """Constant-memory throughput tracker over fixed, consecutive time windows.
+
+    Reports the rate of the first window after the first byte (slow-start
+    dominated), the sustained rate over everything after it, and the best
+    single window.
+    """
+
+    def __init__(self, window=0.25):
+        self._window = window
+        self._first_byte_at = None
+        self._window_start = None
+        self._window_bytes = 0
+        self._windows = 0
+        self._first_window_bps = None
+        self._peak_window_bps = 0.0
+        self._first_window_end = None
+        self._total_bytes = 0
+        self._bytes_after_first = 0
+        self._last_at = None
+
+    def add(self, nbytes, now=None):
+        now = time.perf_counter() if now is None else now
+        if self._first_byte_at is None:
+            self._first_byte_at = self._window_start = now
+        while now - self._window_start >= self._window:
+            self._close_window()
+        self._window_bytes += nbytes
+        self._total_bytes += nbytes
+        if self._first_window_end is not None:
+            self._bytes_after_first += nbytes
+        self._last_at = now
+
+    def _close_window(self):
+        rate = self._window_bytes / self._window
+        if self._first_window_bps is None:
+            self._first_window_bps = rate
+            self._first_window_end = self._window_start + self._window
+        self._peak_window_bps = max(self._peak_window_bps, rate)
+        self._windows += 1
+        self._window_start += self._window
+        self._window_bytes = 0
+
+    def summary(self):
+        if self._first_byte_at is None:
+            return {"window_ms": self._window * 1000, "windows": 0, "first_window_bps": None,
+                    "sustained_bps": None, "peak_window_bps": None}
+        if self._first_window_end is None:
+            # Transfer finished inside the first window: one partial window
+            elapsed = self._last_at - self._first_byte_at
+            rate = self._total_bytes / elapsed if elapsed > 0 else None
+            return {"window_ms": self._window * 1000, "windows": 1, "first_window_bps": rate,
+                    "sustained_bps": None, "peak_window_bps": rate}
+        sustained_time = self._last_at - self._first_window_end
+        sustained = self._bytes_after_first / sustained_time if sustained_time > 0 else None
+        return {
+            "window_ms": self._window * 1000,
+            "windows": self._windows + (1 if self._window_bytes else 0),
+            "first_window_bps": self._first_window_bps,
+            "sustained_bps": sustained,
+            "peak_window_bps": self._peak_window_bps,
+        }
+
+
+def read_body(response, max_bytes, max_seconds=None, chunk_size=65536, window=0.25):
+    """Drain the raw response body into one reusable buffer and measure throughput.
+
+    Reading stops at EOF, after `max_bytes`, or once `max_seconds` have
+    passed, so memory stays at `chunk_size` regardless of the body size.
+    Bytes are counted as received on the wire (before content decoding).
+
+    Returns a dict with `bytes`, `truncated`, `stop_reason` and `throughput`.
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    meter = ThroughputMeter(window)
+    deadline = time.perf_counter() + max_seconds if max_seconds else None
+    total = 0
+    stop_reason = "eof"
+    while True:
+        # Read one byte past the cap so a body of exactly max_bytes is not flagged truncated
+        n = response.raw.readinto(view[:min(chunk_size, max_bytes - total + 1)])
+        if not n:
+            break
+        now = time.perf_counter()
+        if total + n > max_bytes:
+            meter.add(max_bytes - total, now)
+            total = max_bytes
+            stop_reason = "max_bytes"
+            break
+        total += n
+        meter.add(n, now)
+        if deadline is not None and now >= deadline:
+            stop_reason = "max_seconds"
+            break
+    return {
+        "bytes": total,
+        "truncated": stop_reason != "eof",
+        "stop_reason": stop_reason,
+        "throughput": meter.summary(),
+    }
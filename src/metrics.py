@@ -0,0 +1,166 @@
+"""In-process Prometheus-style metrics that aggregate across Gunicorn workers."""
+import json
+import os
+import sys
+import threading
+import time
+
+
+class MetricsRegistry:
+    """Counters and fixed-bucket histograms rendered in Prometheus text format.
+
+    Updates only touch a dict in process memory. With `directory` set, each
+    worker also writes its values to `metrics-<pid>.json` in that directory
+    every `sync_interval` seconds (atomic rename), and `render()` sums the
+    files of every worker, using live values for its own process. Files of
+    exited workers are kept so counters never go backwards; the directory is
+    expected to be emptied when the server starts (see gunicorn.conf.py).
+    """
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, directory=None, sync_interval=5.0):
+        self._directory = directory
+        self._sync_interval = sync_interval
+        self._metrics = {}  # name -> (type, help, buckets)
+        self._values = {}  # (series name, labels tuple) -> float
+        self._lock = threading.Lock()
+        self._pid = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def counter(self, name, help_text):
+        self._metrics[name] = ("counter", help_text, None)
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self._metrics[name] = ("histogram", help_text, tuple(buckets))
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._ensure_process()
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        buckets = self._metrics[name][2]
+        base = tuple(sorted(labels.items()))
+        with self._lock:
+            self._ensure_process()
+            for bound in buckets:
+                if value <= bound:
+                    key = (f"{name}_bucket", base + (("le", str(bound)),))
+                    self._values[key] = self._values.get(key, 0) + 1
+                    break
+            for series, amount in ((f"{name}_count", 1), (f"{name}_sum", value)):
+                self._values[(series, base)] = self._values.get((series, base), 0) + amount
+
+    def render(self):
+        """Return all metrics, summed across workers, in Prometheus text exposition format."""
+        values = self._collect()
+        lines = []
+        for name, (kind, help_text, buckets) in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for labels, value in sorted(values.get(name, {}).items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            # Buckets are stored per bucket and made cumulative here
+            by_labels = {}
+            for labels, value in values.get(f"{name}_bucket", {}).items():
+                le = dict(labels)["le"]
+                by_labels.setdefault(tuple(kv for kv in labels if kv[0] != "le"), {})[le] = value
+            for labels in sorted(values.get(f"{name}_count", {})):
+                counts = by_labels.get(labels, {})
+                cumulative = 0
+                for bound in buckets:
+                    cumulative += counts.get(str(bound), 0)
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', str(bound)),))} "
+                                 f"{_format_value(cumulative)}")
+                count = values[f"{name}_count"][labels]
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {_format_value(count)}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(values[f'{name}_sum'][labels])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {_format_value(count)}")
+        return "\n".join(lines) + "\n"
+
+    def sync(self):
+        """Write this worker's values to its file in the shared directory."""
+        if not self._directory:
+            return
+        with self._lock:
+            items = [[name, list(labels), value] for (name, labels), value in self._values.items()]
+        path = self._path(os.getpid())
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(items, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[MetricsRegistry] Sync failed: {e}", file=sys.stderr)
+
+    def _collect(self):
+        """Merge other workers' files with this process's live values."""
+        merged = {}
+        own_pid = os.getpid()
+        if self._directory:
+            try:
+                names = os.listdir(self._directory)
+            except FileNotFoundError:
+                names = []
+            for file_name in names:
+                if not (file_name.startswith("metrics-") and file_name.endswith(".json")):
+                    continue
+                if file_name == os.path.basename(self._path(own_pid)):
+                    continue
+                try:
+                    with open(os.path.join(self._directory, file_name)) as f:
+                        items = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                for name, labels, value in items:
+                    _add(merged, name, tuple(tuple(kv) for kv in labels), value)
+        with self._lock:
+            own = list(self._values.items()) if self._pid == own_pid else []
+        for (name, labels), value in own:
+            _add(merged, name, labels, value)
+        return merged
+
+    def _ensure_process(self):
+        """Start fresh after fork so workers never report the parent's values. Caller holds the lock."""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._values = {}
+        if self._directory:
+            thread = threading.Thread(target=self._run_sync, daemon=True)
+            thread.start()
+
+    def _run_sync(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(self._sync_interval)
+            self.sync()
+
+    def _path(self, pid):
+        return os.path.join(self._directory, f"metrics-{pid}.json")
+
+
+def _add(merged, name, labels, value):
+    series = merged.setdefault(name, {})
+    series[labels] = series.get(labels, 0) + value
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value):
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
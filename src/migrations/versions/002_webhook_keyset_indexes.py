@@ -0,0 +1,30 @@
+"""Keyset pagination indexes for webhook_events
+
+Revision ID: 002_keyset_indexes
+Revises: 001_initial
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002_keyset_indexes'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (timestamp, id) is the /webhook-results page key; id breaks timestamp ties
+    op.drop_index('idx_webhook_events_timestamp', table_name='webhook_events')
+    op.create_index('idx_webhook_events_timestamp_id', 'webhook_events',
+                    [sa.text('timestamp DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('idx_webhook_events_type_timestamp_id', 'webhook_events',
+                    ['event_type', sa.text('timestamp DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('idx_webhook_events_type_timestamp_id', table_name='webhook_events')
+    op.drop_index('idx_webhook_events_timestamp_id', table_name='webhook_events')
+    op.create_index('idx_webhook_events_timestamp', 'webhook_events', [sa.text('timestamp DESC')], unique=False)
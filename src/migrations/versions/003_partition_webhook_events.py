@@ -0,0 +1,94 @@
+"""Range-partition webhook_events by timestamp
+
+Revision ID: 003_partition_webhook_events
+Revises: 002_keyset_indexes
+Create Date: 2026-10-17
+
+"""
+import os
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_partition_webhook_events'
+down_revision = '002_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+# Copies every row of webhook_events_old into the new webhook_events
+COPY_ROWS = """
+    INSERT INTO webhook_events (id, user_id, timestamp, event_type, source_ip, dns_target,
+                                dns_records, dns_error, payload, created_at)
+    SELECT id, user_id, timestamp, event_type, source_ip, dns_target,
+           dns_records, dns_error, payload, created_at
+    FROM webhook_events_old
+"""
+
+
+def _create_table(partitioned):
+    # The partition key has to be part of the primary key of a partitioned table
+    op.execute(f"""
+        CREATE TABLE webhook_events (
+            id UUID NOT NULL,
+            user_id UUID REFERENCES users (id) ON DELETE SET NULL,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+            event_type VARCHAR(100) NOT NULL,
+            source_ip VARCHAR(45) NOT NULL,
+            dns_target VARCHAR(255) NOT NULL,
+            dns_records JSONB,
+            dns_error TEXT,
+            payload JSONB NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE,
+            PRIMARY KEY ({'id, timestamp' if partitioned else 'id'})
+        ){' PARTITION BY RANGE (timestamp)' if partitioned else ''}
+    """)
+    op.create_index('idx_webhook_events_timestamp_id', 'webhook_events',
+                    [sa.text('timestamp DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('idx_webhook_events_type_timestamp_id', 'webhook_events',
+                    ['event_type', sa.text('timestamp DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('idx_webhook_events_user_id', 'webhook_events', ['user_id'], unique=False)
+
+
+def _rename_old_table():
+    op.execute("ALTER TABLE webhook_events RENAME TO webhook_events_old")
+    op.execute("ALTER TABLE webhook_events_old RENAME CONSTRAINT webhook_events_pkey TO webhook_events_old_pkey")
+    op.drop_index('idx_webhook_events_user_id', table_name='webhook_events_old')
+    op.drop_index('idx_webhook_events_type_timestamp_id', table_name='webhook_events_old')
+    op.drop_index('idx_webhook_events_timestamp_id', table_name='webhook_events_old')
+
+
+def upgrade():
+    # Partitions are named and sized like partitions.py; it pre-creates later ones at runtime
+    interval = os.environ.get("WEBHOOK_PARTITION_INTERVAL", "month")
+    _rename_old_table()
+    _create_table(partitioned=True)
+
+    now = datetime.now(timezone.utc)
+    oldest, newest = op.get_bind().execute(
+        sa.text("SELECT min(timestamp), max(timestamp) FROM webhook_events_old")).one()
+    latest = max(now, newest or now)
+    start = (oldest or now).astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval != "day":
+        start = start.replace(day=1)
+    # Every period holding existing rows, through the first one after now
+    while True:
+        end = start + timedelta(days=1) if interval == "day" else (start + timedelta(days=32)).replace(day=1)
+        name = f"webhook_events_p{start.strftime('%Y%m%d' if interval == 'day' else '%Y%m')}"
+        op.execute(f"CREATE TABLE {name} PARTITION OF webhook_events "
+                   f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')")
+        if start > latest:
+            break
+        start = end
+
+    op.execute(COPY_ROWS)
+    op.drop_table('webhook_events_old')
+
+
+def downgrade():
+    _rename_old_table()
+    _create_table(partitioned=False)
+    op.execute(COPY_ROWS)
+    # Drops the partitions along with the parent
+    op.drop_table('webhook_events_old')
@@ -21,12 +21,15 @@ class User(Base):
 
 
 class WebhookEvent(Base):
-    """Stores incoming webhook events with DNS lookup results."""
+    """Stores incoming webhook events with DNS lookup results.
+
+    Range-partitioned by timestamp (migration 003), so the primary key includes it.
+    """
     __tablename__ = 'webhook_events'
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
-    timestamp = Column(DateTime(timezone=True), nullable=False)
+    timestamp = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     event_type = Column(String(100), nullable=False)
     source_ip = Column(String(45), nullable=False)
     dns_target = Column(String(255), nullable=False)
@@ -38,8 +41,10 @@ class WebhookEvent(Base):
     user = relationship("User", back_populates="webhook_events")
 
     __table_args__ = (
-        Index('idx_webhook_events_timestamp', timestamp.desc()),
+        Index('idx_webhook_events_timestamp_id', timestamp.desc(), id.desc()),
+        Index('idx_webhook_events_type_timestamp_id', event_type, timestamp.desc(), id.desc()),
         Index('idx_webhook_events_user_id', user_id),
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
     )
 
 
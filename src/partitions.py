@@ -0,0 +1,133 @@
+import re
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+TABLE = "webhook_events"
+INTERVALS = ("day", "month")
+
+
+def period_start(moment, interval):
+    """Start (UTC midnight or first of month) of the partition period containing `moment`."""
+    moment = moment.astimezone(timezone.utc)
+    start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return start if interval == "day" else start.replace(day=1)
+
+
+def next_period(start, interval):
+    if interval == "day":
+        return start + timedelta(days=1)
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def partition_name(start, interval):
+    return f"{TABLE}_p{start.strftime('%Y%m%d' if interval == 'day' else '%Y%m')}"
+
+
+class PartitionMaintainer:
+    """Keeps the range-partitioned webhook_events table ahead of time and within retention.
+
+    Every `check_interval` seconds one worker (whichever takes the Postgres
+    advisory lock) creates partitions for the current period and the next
+    `premake` periods, and removes every partition whose upper bound is older
+    than `retention_days` with DETACH PARTITION ... CONCURRENTLY (PostgreSQL
+    14+) and DROP TABLE. Expiry never runs a DELETE, leaves dead tuples to
+    vacuum, or blocks writers on an ACCESS EXCLUSIVE lock of the parent.
+    `retention_days=0` keeps everything. Does nothing until the table has
+    been partitioned (migration 003). With `check_interval=0` no thread is
+    started; call `run_once()`.
+    """
+
+    LOCK_KEY = 0x636E6E63  # "cnnc"
+
+    def __init__(self, engine, retention_days=0, interval="month", premake=2, check_interval=3600.0):
+        if interval not in INTERVALS:
+            raise ValueError(f"interval must be one of {INTERVALS}")
+        self._engine = engine
+        self._retention_days = retention_days
+        self._interval = interval
+        self._premake = premake
+        self._check_interval = check_interval
+        self._closed = threading.Event()
+        if check_interval > 0:
+            self._thread = threading.Thread(target=self._run, name="partition-maintainer", daemon=True)
+            self._thread.start()
+
+    def run_once(self, now=None):
+        """Create upcoming partitions and drop expired ones; returns the names touched."""
+        now = now or datetime.now(timezone.utc)
+        created, dropped = [], []
+        # DETACH ... CONCURRENTLY cannot run inside a transaction block, so every
+        # statement autocommits and the advisory lock is held for the session
+        with self._engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.LOCK_KEY}).scalar():
+                return {"created": created, "dropped": dropped, "skipped": "locked"}
+            try:
+                kind = conn.execute(text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+                                    {"table": TABLE}).scalar()
+                if kind != "p":
+                    return {"created": created, "dropped": dropped, "skipped": "not_partitioned"}
+
+                existing = self._partitions(conn)
+                start = period_start(now, self._interval)
+                for _ in range(self._premake + 1):
+                    end = next_period(start, self._interval)
+                    name = partition_name(start, self._interval)
+                    if name not in existing:
+                        try:
+                            conn.execute(text(
+                                f'CREATE TABLE "{name}" PARTITION OF {TABLE} '
+                                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                            ))
+                            created.append(name)
+                        except Exception as e:
+                            # e.g. overlaps a partition made with a different interval
+                            print(f"[PartitionMaintainer] Cannot create {name}: {e}", file=sys.stderr)
+                    start = end
+
+                if self._retention_days > 0:
+                    cutoff = now - timedelta(days=self._retention_days)
+                    for name, (upper, detach_pending) in existing.items():
+                        if upper is None or upper > cutoff:
+                            continue
+                        # CONCURRENTLY only takes SHARE UPDATE EXCLUSIVE on the parent, so
+                        # inserts and result queries keep running; FINALIZE completes a
+                        # detach that an earlier run started but did not finish
+                        mode = "FINALIZE" if detach_pending else "CONCURRENTLY"
+                        conn.execute(text(f'ALTER TABLE {TABLE} DETACH PARTITION "{name}" {mode}'))
+                        conn.execute(text(f'DROP TABLE "{name}"'))
+                        dropped.append(name)
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.LOCK_KEY})
+        return {"created": created, "dropped": dropped}
+
+    def close(self):
+        self._closed.set()
+
+    def _partitions(self, conn):
+        """Map of partition name -> (exclusive upper bound, detach pending).
+
+        The bound is None for MAXVALUE or DEFAULT partitions.
+        """
+        rows = conn.execute(text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), i.inhdetachpending FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:table)"
+        ), {"table": TABLE}).all()
+        partitions = {}
+        for name, bound, detach_pending in rows:
+            match = re.search(r"TO \('([^']+)'\)", bound or "")
+            partitions[name] = (datetime.fromisoformat(match.group(1)) if match else None, detach_pending)
+        return partitions
+
+    def _run(self):
+        while not self._closed.is_set():
+            try:
+                result = self.run_once()
+                if result["created"] or result["dropped"]:
+                    print(f"[PartitionMaintainer] Created {result['created']}, dropped {result['dropped']}",
+                          file=sys.stderr)
+            except Exception as e:
+                print(f"[PartitionMaintainer] Maintenance failed: {e}", file=sys.stderr)
+            self._closed.wait(self._check_interval)
@@ -0,0 +1,135 @@
+"""Concurrent TCP connect probes built on asyncio."""
+import asyncio
+import concurrent.futures
+import math
+import socket
+import statistics
+import time
+
+try:
+    from aio import background_loop
+except ImportError:
+    from src.aio import background_loop
+
+
+async def _probe_one(host, port, timeout, semaphore):
+    async with semaphore:
+        start_time = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        except asyncio.TimeoutError:
+            return {"target": host, "port": port, "open": False, "latency_ms": None, "error": "timeout"}
+        except Exception as e:
+            return {"target": host, "port": port, "open": False, "latency_ms": None,
+                    "error": str(e) or type(e).__name__}
+        latency = (time.perf_counter() - start_time) * 1000
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:  # nosec B110 - connection already measured, close errors are irrelevant
+            pass
+        return {"target": host, "port": port, "open": True, "latency_ms": round(latency, 2), "error": None}
+
+
+def iter_probes(probes, concurrency=100, timeout=3.0):
+    """Connect to every (host, port) pair concurrently, yielding results as they finish.
+
+    At most `concurrency` connects are in flight at once and each one is
+    bounded by `timeout` seconds, so the total wall time is roughly
+    ceil(len(probes) / concurrency) * timeout in the worst case. Sockets
+    are multiplexed on the process-wide background loop; the calling thread
+    only waits for results.
+    """
+    # Semaphore binds to the background loop on first use, not here
+    semaphore = asyncio.Semaphore(concurrency)
+    futures = [background_loop.submit(_probe_one(host, port, timeout, semaphore)) for host, port in probes]
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def run_probes(probes, concurrency=100, timeout=3.0):
+    """Probe every (host, port) pair concurrently and return results in input order."""
+    probes = list(probes)
+    results = {(r["target"], r["port"]): r for r in iter_probes(probes, concurrency, timeout)}
+    return [results[(host, port)] for host, port in probes]
+
+
+async def _timed_connect(ip, port, delay, timeout):
+    """Wait `delay` seconds, then return the TCP handshake time in ms or None on failure."""
+    await asyncio.sleep(delay)
+    start_time = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+    except Exception:
+        return None
+    latency = (time.perf_counter() - start_time) * 1000
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except Exception:  # nosec B110 - connection already measured, close errors are irrelevant
+        pass
+    return latency
+
+
+async def _gather_samples(ip, port, samples, interval, timeout):
+    return await asyncio.gather(
+        *(_timed_connect(ip, port, i * interval, timeout) for i in range(samples))
+    )
+
+
+def _percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted, non-empty list."""
+    rank = (len(sorted_values) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def latency_stats(values):
+    """Summarize latency samples (ms) as min/avg/p50/p95/p99/max/stddev."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    stats = {
+        "min": ordered[0],
+        "avg": statistics.fmean(ordered),
+        "p50": _percentile(ordered, 50),
+        "p95": _percentile(ordered, 95),
+        "p99": _percentile(ordered, 99),
+        "max": ordered[-1],
+        "stddev": statistics.pstdev(ordered),
+    }
+    return {k: round(v, 2) for k, v in stats.items()}
+
+
+def sample_connect(host, port=443, samples=5, interval=0.1, timeout=3.0):
+    """Measure DNS resolution once, then run `samples` TCP connects to the resolved address.
+
+    Connect `i` starts at `i * interval` seconds and all of them run on the
+    background event loop, so a blackholed target costs about
+    `(samples - 1) * interval + timeout` seconds instead of `samples * timeout`.
+    """
+    dns_start = time.perf_counter()
+    try:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except OSError as e:
+        return {"resolved_ip": None, "dns_ms": None, "samples": samples, "received": 0,
+                "loss_rate": 1.0, "stats": None, "error": str(e)}
+    dns_ms = (time.perf_counter() - dns_start) * 1000
+    ip = infos[0][4][0]
+
+    results = background_loop.run(_gather_samples(ip, port, samples, interval, timeout))
+
+    latencies = [r for r in results if r is not None]
+    return {
+        "resolved_ip": ip,
+        "dns_ms": round(dns_ms, 2),
+        "samples": samples,
+        "received": len(latencies),
+        "loss_rate": round(1 - len(latencies) / samples, 4),
+        "stats": latency_stats(latencies),
+        "error": None,
+    }
@@ -0,0 +1,122 @@
+"""Sampling and per-endpoint roll-ups for the cnnct.requests request logger."""
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class RequestLogSampler:
+    """Decides which requests are logged individually and aggregates the rest.
+
+    Every request is counted into a per-(endpoint, method) bucket with status
+    class counts and a cumulative latency histogram. Errors (status >= 400)
+    and requests slower than `slow_ms` are always logged individually; the
+    remaining fast successes are logged with probability `sample_rate`. Every
+    `interval` seconds the buckets are handed to `emit_summary` as a single
+    document and reset.
+    """
+
+    # Upper bounds (ms) of the latency histogram buckets; the last bucket is +Inf
+    LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self, emit_summary, sample_rate=0.1, slow_ms=1000.0, interval=60.0):
+        self._emit_summary = emit_summary
+        self._sample_rate = sample_rate
+        self._slow_ms = slow_ms
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._window_start = time.time()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def observe(self, endpoint, method, status_code, latency_ms):
+        """Count one request and decide whether it is also logged on its own.
+
+        Returns the sample rate the request was kept at (1.0 for errors and
+        slow requests), or None if it is only counted in the summary.
+        """
+        with self._lock:
+            key = (endpoint, method)
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = {
+                    "count": 0,
+                    "status": {},
+                    "latency_sum_ms": 0.0,
+                    "latency_max_ms": 0.0,
+                    "buckets": [0] * (len(self.LATENCY_BUCKETS_MS) + 1),
+                }
+            entry["count"] += 1
+            status_class = f"{status_code // 100}xx"
+            entry["status"][status_class] = entry["status"].get(status_class, 0) + 1
+            entry["latency_sum_ms"] += latency_ms
+            entry["latency_max_ms"] = max(entry["latency_max_ms"], latency_ms)
+            for i, bound in enumerate(self.LATENCY_BUCKETS_MS):
+                if latency_ms <= bound:
+                    entry["buckets"][i] += 1
+                    break
+            else:
+                entry["buckets"][-1] += 1
+
+        if status_code >= 400 or latency_ms >= self._slow_ms:
+            return 1.0
+        if random.random() < self._sample_rate:  # nosec B311 - log sampling, not security
+            return self._sample_rate
+        return None
+
+    def summarize(self):
+        """Return the summary document for the current window and start a new one."""
+        now = time.time()
+        with self._lock:
+            stats, self._stats = self._stats, {}
+            window_start, self._window_start = self._window_start, now
+        endpoints = []
+        for (endpoint, method), entry in sorted(stats.items(), key=lambda item: str(item[0])):
+            cumulative = 0
+            histogram = {}
+            for bound, count in zip(self.LATENCY_BUCKETS_MS + ("inf",), entry["buckets"]):
+                cumulative += count
+                histogram[f"le_{bound}"] = cumulative
+            endpoints.append({
+                "endpoint": endpoint,
+                "method": method,
+                "count": entry["count"],
+                "status": entry["status"],
+                "latency_ms": {
+                    "avg": round(entry["latency_sum_ms"] / entry["count"], 2),
+                    "max": round(entry["latency_max_ms"], 2),
+                    "sum": round(entry["latency_sum_ms"], 2),
+                },
+                "histogram": histogram,
+            })
+        return {
+            "window_start": datetime.fromtimestamp(window_start, tz=timezone.utc).isoformat(),
+            "window_seconds": round(now - window_start, 3),
+            "total_requests": sum(e["count"] for e in endpoints),
+            "sample_rate": self._sample_rate,
+            "slow_ms": self._slow_ms,
+            "endpoints": endpoints,
+        }
+
+    def flush(self):
+        """Emit the current window's summary if it saw any requests."""
+        summary = self.summarize()
+        if not summary["endpoints"]:
+            return
+        try:
+            self._emit_summary(summary)
+        except Exception as e:
+            print(f"[RequestLogSampler] Summary emit failed: {e}", file=sys.stderr)
+
+    def close(self):
+        self._closed = True
+        self.flush()
+
+    def _run(self):
+        while not self._closed:
+            time.sleep(self._interval)
+            if not self._closed:
+                self.flush()
@@ -0,0 +1,170 @@
+import collections
+import contextlib
+import fcntl
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+
+
+class ResultRing:
+    """Bounded newest-first store for recent webhook results, shared by all workers.
+
+    With Valkey, results go to one capped list (LPUSH and LTRIM in a single
+    pipeline). Otherwise, with `path` set, they go to a fixed-size file of
+    `max_items` slots of `slot_bytes` each that every worker maps into
+    memory; writers take an exclusive flock and readers a shared one. Without
+    either the ring is a deque private to the process. Appends are O(1) in
+    every case and memory stays under `max_items * slot_bytes`: results that
+    don't fit a slot are stored with their payload replaced by a marker.
+    """
+
+    KEY = "cnnct:webhooks:recent"
+    MAGIC = b"CNNCTRB1"
+    HEADER = struct.Struct("<8sQQQ")  # magic, total appended, max_items, slot_bytes
+    LENGTH = struct.Struct("<I")
+
+    def __init__(self, redis_url=None, path=None, max_items=50, slot_bytes=8192):
+        self._max_items = max_items
+        self._slot_bytes = slot_bytes
+        self._lock = threading.Lock()
+        self._local = collections.deque(maxlen=max_items)
+        self._redis = None
+        self._map = None
+        self._fd = None
+        self._path = path
+        self._pid = None
+
+        if redis_url and redis_url != "memory://":
+            try:
+                import redis
+                self._redis = redis.from_url(redis_url, socket_connect_timeout=2, socket_timeout=2)
+                self._redis.ping()
+            except Exception as e:
+                print(f"[ResultRing] Valkey unavailable, using {'mmap' if path else 'memory'}: {e}",
+                      file=sys.stderr)
+                self._redis = None
+        if self._redis is None and path:
+            try:
+                self._open(path)
+            except OSError as e:
+                print(f"[ResultRing] Cannot map {path}, using memory: {e}", file=sys.stderr)
+
+    @property
+    def backend(self):
+        if self._redis is not None:
+            return "valkey"
+        return "mmap" if self._map is not None else "memory"
+
+    def append(self, result):
+        data = self._encode(result)
+        if data is None:
+            return
+        if self._redis is not None:
+            try:
+                pipe = self._redis.pipeline()
+                pipe.lpush(self.KEY, data)
+                pipe.ltrim(self.KEY, 0, self._max_items - 1)
+                pipe.execute()
+                return
+            except Exception as e:
+                print(f"[ResultRing] Valkey append failed, keeping in memory: {e}", file=sys.stderr)
+        if self._map is not None:
+            with self._locked(fcntl.LOCK_EX):
+                total = self._total()
+                offset = self._slot_offset(total % self._max_items)
+                self._map[offset:offset + self.LENGTH.size + len(data)] = self.LENGTH.pack(len(data)) + data
+                self._map[:self.HEADER.size] = self.HEADER.pack(self.MAGIC, total + 1, self._max_items,
+                                                                 self._slot_bytes)
+            return
+        with self._lock:
+            self._local.appendleft(data)
+
+    def items(self):
+        """Stored results, newest first."""
+        encoded = []
+        if self._redis is not None:
+            try:
+                encoded = self._redis.lrange(self.KEY, 0, -1)
+            except Exception as e:
+                print(f"[ResultRing] Valkey read failed: {e}", file=sys.stderr)
+        if self._map is not None:
+            with self._locked(fcntl.LOCK_SH):
+                total = self._total()
+                for i in range(min(total, self._max_items)):
+                    offset = self._slot_offset((total - 1 - i) % self._max_items)
+                    (length,) = self.LENGTH.unpack_from(self._map, offset)
+                    start = offset + self.LENGTH.size
+                    encoded.append(self._map[start:start + length])
+        with self._lock:
+            # Results kept locally while Valkey was failing
+            encoded += list(self._local)
+        return [json.loads(data) for data in encoded]
+
+    def clear(self):
+        if self._redis is not None:
+            try:
+                self._redis.delete(self.KEY)
+            except Exception as e:
+                print(f"[ResultRing] Valkey clear failed: {e}", file=sys.stderr)
+        if self._map is not None:
+            with self._locked(fcntl.LOCK_EX):
+                self._map[:self.HEADER.size] = self.HEADER.pack(self.MAGIC, 0, self._max_items, self._slot_bytes)
+        with self._lock:
+            self._local.clear()
+
+    def _encode(self, result):
+        limit = self._slot_bytes - self.LENGTH.size
+        data = json.dumps(result, default=str).encode()
+        if len(data) > limit:
+            data = json.dumps({**result, "payload": {"truncated": True}}, default=str).encode()
+        if len(data) > limit:
+            print(f"[ResultRing] Result of {len(data)} bytes exceeds slot size, dropped", file=sys.stderr)
+            return None
+        return data
+
+    def _open(self, path):
+        size = self.HEADER.size + self._max_items * self._slot_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            # Another worker may have created it already; reset it only if the layout differs
+            header = os.pread(fd, self.HEADER.size, 0)
+            expected = (self.MAGIC, self._max_items, self._slot_bytes)
+            if os.fstat(fd).st_size != size or len(header) < self.HEADER.size or \
+                    tuple(self.HEADER.unpack(header)[i] for i in (0, 2, 3)) != expected:
+                os.ftruncate(fd, size)
+                os.pwrite(fd, self.HEADER.pack(self.MAGIC, 0, self._max_items, self._slot_bytes), 0)
+            self._map = mmap.mmap(fd, size)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        except OSError:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self._pid = os.getpid()
+
+    def _total(self):
+        return self.HEADER.unpack_from(self._map, 0)[1]
+
+    def _slot_offset(self, slot):
+        return self.HEADER.size + slot * self._slot_bytes
+
+    @contextlib.contextmanager
+    def _locked(self, operation):
+        # flock excludes other workers; the thread lock excludes threads sharing our descriptor
+        with self._lock:
+            if self._pid != os.getpid():
+                # A forked child shares the parent's open file, and with it the parent's flock
+                self._map.close()
+                os.close(self._fd)
+                self._open(self._path)
+            fcntl.flock(self._fd, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
@@ -0,0 +1,146 @@
+import json
+import os
+import sys
+import time
+
+
+class SpillQueue:
+    """Append-only, segment-rotated NDJSON spill directory for undeliverable log docs.
+
+    Batches are written with a single append per batch into the current
+    segment, which rotates once it reaches `segment_bytes`. Total disk use is
+    capped at `max_bytes` by deleting the oldest segments first. Segments are
+    replayed oldest-first: a reader claims a segment by renaming it, so
+    several Gunicorn workers can share one directory without double-sending.
+    """
+
+    SUFFIX = ".ndjson"
+    CLAIM_MARKER = ".replaying-"
+    # Segments written by other processes this recently may still receive appends
+    SETTLE_SECONDS = 2.0
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, segment_bytes=1024 * 1024):
+        os.makedirs(directory, exist_ok=True)
+        self._dir = directory
+        self._max_bytes = max_bytes
+        self._segment_bytes = segment_bytes
+        self._current = None
+        self._current_size = 0
+        self.evicted_segments = 0
+        self._recover_claims()
+
+    def append(self, docs):
+        """Write a batch of docs to the current segment, rotating and evicting as needed."""
+        data = "".join(json.dumps(doc, default=str) + "\n" for doc in docs).encode()
+        if self._current is None or (self._current_size and self._current_size + len(data) > self._segment_bytes):
+            self._current = os.path.join(self._dir, f"{time.time_ns():020d}-{os.getpid()}{self.SUFFIX}")
+            self._current_size = 0
+        with open(self._current, "ab") as f:
+            f.write(data)
+        self._current_size += len(data)
+        self._enforce_cap()
+
+    def claim_oldest(self):
+        """Claim the oldest settled segment for replay; returns the claimed path or None."""
+        now = time.time()
+        for name in self._segments():
+            path = os.path.join(self._dir, name)
+            if path == self._current:
+                # Stop appending to it; the next append starts a new segment
+                self._current = None
+            elif not name.endswith(f"-{os.getpid()}{self.SUFFIX}"):
+                try:
+                    if now - os.path.getmtime(path) < self.SETTLE_SECONDS:
+                        continue
+                except FileNotFoundError:
+                    continue
+            claimed = f"{path}{self.CLAIM_MARKER}{os.getpid()}"
+            try:
+                os.rename(path, claimed)
+            except FileNotFoundError:
+                continue  # another worker claimed or evicted it first
+            return claimed
+        return None
+
+    def read(self, claimed):
+        """Load the docs of a claimed segment, skipping torn or corrupt lines."""
+        docs = []
+        with open(claimed, "rb") as f:
+            for line in f:
+                try:
+                    docs.append(json.loads(line))
+                except ValueError:
+                    continue
+        return docs
+
+    def unclaim(self, claimed):
+        """Put a claimed segment back at its original position after a failed replay."""
+        segment = claimed.partition(self.CLAIM_MARKER)[0]
+        try:
+            os.rename(claimed, segment)
+        except FileNotFoundError:
+            pass
+
+    def release(self, claimed):
+        """Delete a claimed segment after it has been replayed (or re-spilled)."""
+        try:
+            os.remove(claimed)
+        except FileNotFoundError:
+            pass
+
+    def size_bytes(self):
+        total = 0
+        for name in self._segments():
+            try:
+                total += os.path.getsize(os.path.join(self._dir, name))
+            except FileNotFoundError:
+                continue
+        return total
+
+    def _segments(self):
+        """Unclaimed segment names, oldest first (names start with a ns timestamp)."""
+        try:
+            names = os.listdir(self._dir)
+        except FileNotFoundError:
+            return []
+        return sorted(n for n in names if n.endswith(self.SUFFIX))
+
+    def _enforce_cap(self):
+        total = self.size_bytes()
+        for name in self._segments():
+            if total <= self._max_bytes:
+                break
+            path = os.path.join(self._dir, name)
+            if path == self._current:
+                break
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            self.evicted_segments += 1
+            print(f"[SpillQueue] Disk cap reached, evicted {name}", file=sys.stderr)
+
+    def _recover_claims(self):
+        """Return segments claimed by processes that no longer exist to the queue."""
+        for name in os.listdir(self._dir):
+            if self.CLAIM_MARKER not in name:
+                continue
+            segment, _, pid = name.partition(self.CLAIM_MARKER)
+            if pid.isdigit() and int(pid) != os.getpid() and _pid_alive(int(pid)):
+                continue
+            try:
+                os.rename(os.path.join(self._dir, name), os.path.join(self._dir, segment))
+            except OSError:
+                continue
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
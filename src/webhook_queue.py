@@ -0,0 +1,172 @@
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class WebhookQueue:
+    """Hands received webhooks to background workers for DNS lookup and storage.
+
+    With Valkey configured, events are appended to a stream and consumed
+    through a consumer group shared by every worker process. An entry is
+    acknowledged and deleted only after `process` returns, and entries left
+    unacknowledged by a crashed consumer are reclaimed after CLAIM_IDLE_MS, so
+    the stream holds exactly the events still pending. Without Valkey (or if
+    it fails) events go to a bounded in-process queue instead.
+    """
+
+    STREAM = "cnnct:webhooks"
+    GROUP = "cnnct-webhook-workers"
+    CLAIM_IDLE_MS = 60000
+    BLOCK_MS = 2000
+
+    def __init__(self, process, redis_url=None, workers=4, max_pending=10000):
+        self._process = process
+        self._max_pending = max_pending
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._pending = OrderedDict()  # event_id -> entry, for events in the memory queue
+        self._pending_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._processed = 0
+        self._failed = 0
+        self._redis = None
+        self._consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._closed = False
+
+        if redis_url and redis_url != "memory://":
+            try:
+                import redis
+                self._redis = redis.from_url(redis_url, socket_connect_timeout=2,
+                                             socket_timeout=(self.BLOCK_MS / 1000) + 2)
+                try:
+                    self._redis.xgroup_create(self.STREAM, self.GROUP, id="0", mkstream=True)
+                except redis.ResponseError as e:
+                    if "BUSYGROUP" not in str(e):
+                        raise
+            except Exception as e:
+                print(f"[WebhookQueue] Valkey unavailable, queueing in memory: {e}", file=sys.stderr)
+                self._redis = None
+
+        targets = [self._work_memory] * workers
+        if self._redis is not None:
+            # Keep one memory worker to drain events queued while Valkey was failing
+            targets = [self._work_stream] * workers + [self._work_memory]
+        self._threads = []
+        for i, target in enumerate(targets):
+            thread = threading.Thread(target=target, name=f"webhook-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    @property
+    def backend(self):
+        return "valkey" if self._redis is not None else "memory"
+
+    def enqueue(self, entry):
+        """Queue an entry and return its event id: the entry's `id` if it has one.
+
+        Raises:
+            queue.Full: if `max_pending` events are already waiting
+        """
+        if self._redis is not None:
+            try:
+                if self._redis.xlen(self.STREAM) >= self._max_pending:
+                    raise queue.Full
+                stream_id = self._redis.xadd(self.STREAM, {"data": json.dumps(entry, default=str)}).decode()
+                return entry.get("id") or stream_id
+            except queue.Full:
+                raise
+            except Exception as e:
+                print(f"[WebhookQueue] Valkey enqueue failed, queueing in memory: {e}", file=sys.stderr)
+
+        event_id = entry.get("id") or uuid.uuid4().hex
+        with self._pending_lock:
+            self._pending[event_id] = entry
+        try:
+            self._queue.put_nowait((event_id, entry))
+        except queue.Full:
+            with self._pending_lock:
+                self._pending.pop(event_id, None)
+            raise
+        return event_id
+
+    def pending(self, limit=50):
+        """Newest-first list of events not yet processed, each with `id` and `status`."""
+        items = []
+        if self._redis is not None:
+            try:
+                for event_id, fields in self._redis.xrevrange(self.STREAM, count=limit):
+                    data = json.loads(fields[b"data"])
+                    items.append({"id": event_id.decode(), "status": "pending", **data})
+            except Exception as e:
+                print(f"[WebhookQueue] Valkey read failed: {e}", file=sys.stderr)
+        with self._pending_lock:
+            local = list(self._pending.items())
+        for event_id, entry in reversed(local):
+            items.append({"id": event_id, "status": "pending", **entry})
+        items.sort(key=lambda item: item.get("timestamp", ""), reverse=True)
+        return items[:limit]
+
+    def stats(self):
+        pending = self._queue.qsize()
+        if self._redis is not None:
+            try:
+                pending += self._redis.xlen(self.STREAM)
+            except Exception:
+                pending = None
+        with self._stats_lock:
+            return {"backend": self.backend, "pending": pending,
+                    "processed": self._processed, "failed": self._failed}
+
+    def close(self):
+        self._closed = True
+
+    def _handle(self, entry):
+        try:
+            self._process(entry)
+        except Exception as e:
+            print(f"[WebhookQueue] Processing failed: {e}", file=sys.stderr)
+            with self._stats_lock:
+                self._failed += 1
+            return
+        with self._stats_lock:
+            self._processed += 1
+
+    def _work_memory(self):
+        while not self._closed:
+            try:
+                event_id, entry = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            self._handle(entry)
+            with self._pending_lock:
+                self._pending.pop(event_id, None)
+
+    def _work_stream(self):
+        last_claim = 0.0
+        while not self._closed:
+            try:
+                messages = []
+                if time.monotonic() - last_claim > self.CLAIM_IDLE_MS / 1000:
+                    last_claim = time.monotonic()
+                    claimed = self._redis.xautoclaim(self.STREAM, self.GROUP, self._consumer,
+                                                     min_idle_time=self.CLAIM_IDLE_MS, count=10)
+                    messages = claimed[1]
+                if not messages:
+                    response = self._redis.xreadgroup(self.GROUP, self._consumer, {self.STREAM: ">"},
+                                                      count=10, block=self.BLOCK_MS)
+                    messages = response[0][1] if response else []
+                for event_id, fields in messages:
+                    if fields:  # reclaimed entries deleted meanwhile come back empty
+                        self._handle(json.loads(fields[b"data"]))
+                    pipe = self._redis.pipeline()
+                    pipe.xack(self.STREAM, self.GROUP, event_id)
+                    pipe.xdel(self.STREAM, event_id)
+                    pipe.execute()
+            except Exception as e:
+                print(f"[WebhookQueue] Stream read failed: {e}", file=sys.stderr)
+                time.sleep(1)
@@ -0,0 +1,113 @@
+import queue
+import sys
+import threading
+import time
+
+from sqlalchemy import insert
+
+
+class WebhookWriter:
+    """Write-behind buffer that stores webhook events in batched transactions.
+
+    `add()` only appends to a bounded queue. A single flush thread drains it
+    once `batch_size` rows are waiting or `flush_interval` seconds have passed
+    and writes each batch with one multi-row INSERT in one transaction, so
+    storage holds at most one pooled connection however bursty the webhooks
+    are. `on_flush(rows, error)` is called after every batch (error is None on
+    success) so the caller can count results and fall back for failed rows.
+    """
+
+    def __init__(self, session_factory, model, on_flush=None, batch_size=100, flush_interval=1.0,
+                 max_pending=5000):
+        self._session_factory = session_factory
+        self._model = model
+        self._on_flush = on_flush
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._flushed = 0
+        self._failed = 0
+        self._batches = 0
+        self._thread = threading.Thread(target=self._run, name="webhook-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, row, timeout=1.0):
+        """Queue a row for the next batch; returns False if the queue stayed full for `timeout`."""
+        try:
+            self._queue.put(row, timeout=timeout)
+        except queue.Full:
+            return False
+        if self._queue.qsize() >= self._batch_size:
+            self._wake.set()
+        return True
+
+    def buffered(self):
+        """Rows accepted but not yet written, oldest first."""
+        with self._queue.mutex:
+            return list(self._queue.queue)
+
+    def stats(self):
+        return {
+            "buffered": self._queue.qsize(),
+            "flushed": self._flushed,
+            "failed": self._failed,
+            "batches": self._batches,
+        }
+
+    def flush(self):
+        """Write everything queued so far, one transaction per `batch_size` rows."""
+        with self._flush_lock:
+            while True:
+                rows = []
+                while len(rows) < self._batch_size:
+                    try:
+                        rows.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not rows:
+                    return
+                self._write(rows)
+
+    def close(self):
+        """Stop the flush thread and write out whatever is still queued."""
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    def _write(self, rows):
+        error = None
+        session = self._session_factory()
+        try:
+            session.execute(insert(self._model), rows)
+            session.commit()
+            self._flushed += len(rows)
+        except Exception as e:
+            session.rollback()
+            print(f"[WebhookWriter] Batch insert of {len(rows)} rows failed: {e}", file=sys.stderr)
+            self._failed += len(rows)
+            error = e
+        finally:
+            session.close()
+        self._batches += 1
+        if self._on_flush is not None:
+            try:
+                self._on_flush(rows, error)
+            except Exception as e:
+                print(f"[WebhookWriter] on_flush callback failed: {e}", file=sys.stderr)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            if self._closed:
+                break
+            start_time = time.monotonic()
+            self.flush()
+            # Bound flush frequency under sustained load so batches can fill up
+            remaining = self._flush_interval / 10 - (time.monotonic() - start_time)
+            if remaining > 0:
+                time.sleep(remaining)
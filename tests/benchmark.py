@@ -0,0 +1,381 @@
+"""Micro-benchmarks and load tests for the CNNCT API against local stand-ins.
+
+Everything runs on localhost: a fake DNS server answers every A query, a TCP
+listener and an HTTP server act as probe targets, Valkey is replaced by
+fakeredis when it is installed (memory:// otherwise; INFO, which fakeredis
+lacks, is answered with fixed values), and webhooks go to
+PostgreSQL only if BENCH_DATABASE_URL is set (the in-memory fallback
+otherwise). The Flask app is served by a threaded WSGI server and driven by
+client threads at each concurrency level.
+
+    PYTHONPATH=. python tests/benchmark.py --save-baseline tests/benchmark_baseline.json
+    PYTHONPATH=. python tests/benchmark.py --baseline tests/benchmark_baseline.json
+
+With --baseline, the run exits 1 if any scenario's p50/p99 latency grows, or
+its throughput drops, by more than --threshold (default 20%).
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import socketserver
+import sys
+import threading
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import dns.message
+import dns.rdatatype
+import dns.resolver
+import dns.rrset
+import requests
+
+from src.probe import _percentile
+
+WEBHOOK_SECRET = "bench-secret"  # nosec B105 - local benchmark only
+DIAG_BODY = b"x" * (64 * 1024)
+FAKE_INFO = {"redis_version": "fakeredis", "uptime_in_seconds": 0, "connected_clients": 1,
+             "used_memory_human": "0B"}
+
+
+# --- Local stand-ins ---------------------------------------------------------
+
+class _FakeDNSHandler(socketserver.BaseRequestHandler):
+    """Answers every A query with 127.0.0.1; other types get an empty answer."""
+
+    def handle(self):
+        data, sock = self.request
+        query = dns.message.from_wire(data)
+        response = dns.message.make_response(query)
+        for question in query.question:
+            if question.rdtype == dns.rdatatype.A:
+                response.answer.append(
+                    dns.rrset.from_text(question.name, self.server.ttl, "IN", "A", "127.0.0.1")
+                )
+        sock.sendto(response.to_wire(), self.client_address)
+
+
+class _DiagHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(DIAG_BODY)))
+        self.end_headers()
+        self.wfile.write(DIAG_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_fake_dns(ttl):
+    server = socketserver.ThreadingUDPServer(("127.0.0.1", 0), _FakeDNSHandler)
+    server.daemon_threads = True
+    server.ttl = ttl
+    _serve(server)
+    resolver = dns.resolver.Resolver(configure=False)
+    resolver.nameservers = ["127.0.0.1"]
+    resolver.port = server.server_address[1]
+    resolver.lifetime = 2
+    dns.resolver.default_resolver = resolver
+    return server
+
+
+def start_tcp_listener():
+    """Accept-and-close listener; probes only measure the handshake."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(1024)
+
+    def accept_loop():
+        while True:
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                return
+            conn.close()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    return sock.getsockname()[1]
+
+
+def start_http_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _DiagHandler)
+    server.daemon_threads = True
+    server.handle_error = lambda request, client_address: None
+    return _serve(server).server_address[1]
+
+
+class _InfoPipeline:
+    """Pipeline wrapper that answers INFO locally and queues everything else."""
+
+    def __init__(self, pipe):
+        self._pipe = pipe
+        self._info_at = []  # result positions of INFO calls
+
+    def __getattr__(self, name):
+        return getattr(self._pipe, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._pipe.reset()
+
+    def info(self, section=None, *args, **kwargs):
+        self._info_at.append(len(self._pipe.command_stack) + len(self._info_at))
+        return self
+
+    def execute(self, raise_on_error=True):
+        results = self._pipe.execute(raise_on_error)
+        for position in self._info_at:
+            results.insert(position, dict(FAKE_INFO))
+        self._info_at = []
+        return results
+
+
+def _fake_redis_class():
+    import fakeredis
+
+    class BenchRedis(fakeredis.FakeRedis):
+        """fakeredis has no INFO; fixed answers let /health take its success path."""
+
+        def info(self, section=None, *args, **kwargs):
+            return dict(FAKE_INFO)
+
+        def pipeline(self, transaction=True, shard_hint=None):
+            return _InfoPipeline(super().pipeline(transaction, shard_hint))
+
+    return BenchRedis
+
+
+def load_app(cnnct_port):
+    """Configure the environment for local stand-ins, then import the app.
+
+    `/cnnct` is pointed at `cnnct_port` instead of 443 so it measures a
+    completed handshake rather than a refused connection.
+    """
+    os.environ["WEBHOOK_SECRET"] = WEBHOOK_SECRET
+    os.environ["CANARY_DOMAIN"] = "canary.bench.local"
+    os.environ.pop("OPENSEARCH_URL", None)
+    os.environ.pop("HEALTH_SNAPSHOT_INTERVAL", None)
+    if os.environ.get("BENCH_DATABASE_URL"):
+        os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+    else:
+        os.environ.pop("DATABASE_URL", None)
+
+    backend = "memory"
+    if os.environ.get("BENCH_REDIS_URL"):
+        os.environ["REDIS_URL"] = os.environ["BENCH_REDIS_URL"]
+        backend = "valkey"
+    else:
+        try:
+            import fakeredis
+            import redis
+            fake_server = fakeredis.FakeServer()
+            bench_redis = _fake_redis_class()
+            redis.from_url = lambda url, **kwargs: bench_redis(server=fake_server)
+            os.environ["REDIS_URL"] = "redis://fakeredis:6379/0"
+            backend = "fakeredis"
+        except ImportError:
+            os.environ["REDIS_URL"] = "memory://"
+
+    import logging
+    import src.app
+    from src.app import app, limiter
+    src.app.CNNCT_PORT = cnnct_port
+    limiter.enabled = False
+    logging.disable(logging.WARNING)
+    return app, backend
+
+
+# --- Load generation ---------------------------------------------------------
+
+def run_load(base_url, scenario, concurrency, total_requests):
+    """Fire `total_requests` requests from `concurrency` threads and summarize them."""
+    method, path, body = scenario
+    local = threading.local()
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(_):
+        nonlocal errors
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        start_time = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, json=body, timeout=30)
+            ok = response.status_code < 500
+        except requests.RequestException:
+            ok = False
+        elapsed = (time.perf_counter() - start_time) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total_requests)))
+    wall = time.perf_counter() - start_time
+
+    ordered = sorted(latencies)
+    return {
+        "requests": total_requests,
+        "errors": errors,
+        "rps": round(total_requests / wall, 2),
+        "p50_ms": round(_percentile(ordered, 50), 3),
+        "p99_ms": round(_percentile(ordered, 99), 3),
+    }
+
+
+def http_scenarios(tcp_port, http_port):
+    return {
+        "cnnct": ("GET", "/cnnct?target=127.0.0.1", None),
+        "cnnct_bulk": ("POST", "/cnnct/bulk", {"targets": ["127.0.0.1"], "ports": [tcp_port]}),
+        "dns": ("GET", "/dns/bench.local", None),
+        "diag": ("GET", f"/diag?url=http://127.0.0.1:{http_port}/", None),
+        "health": ("GET", "/health?fresh=1", None),
+        "webhook_receive": ("POST", f"/webhook-receive/{WEBHOOK_SECRET}", {"type": "bench"}),
+        "webhook_results": ("GET", "/webhook-results", None),
+    }
+
+
+# --- Micro-benchmarks --------------------------------------------------------
+
+def micro_benchmarks(number):
+    """Ops/sec of hot in-process helpers, no network involved."""
+    from src.dns_cache import DNSCache
+    from src.metrics import MetricsRegistry
+    from src.probe import latency_stats
+    from src.request_log import RequestLogSampler
+
+    cache = DNSCache(max_entries=1024, max_ttl=300)
+    cache.set("bench.local", "A", ["127.0.0.1"], ttl=300)
+    registry = MetricsRegistry()
+    registry.histogram("bench_seconds", "Benchmark histogram.")
+    sampler = RequestLogSampler(lambda summary: None, sample_rate=0.1, interval=3600)
+    samples = [float(i % 97) for i in range(1000)]
+
+    cases = {
+        "dns_cache_hit": lambda: cache.get("bench.local", "A"),
+        "metrics_observe": lambda: registry.observe("bench_seconds", 0.042, endpoint="dns", method="GET"),
+        "request_sampler_observe": lambda: sampler.observe("dns", "GET", 200, 12.5),
+        "latency_stats_1k": lambda: latency_stats(samples),
+    }
+    results = {}
+    for name, func in cases.items():
+        n = number // 100 if name == "latency_stats_1k" else number
+        elapsed = timeit.timeit(func, number=n)
+        results[name] = {"ops_per_sec": round(n / elapsed, 1)}
+    return results
+
+
+# --- Baselines ---------------------------------------------------------------
+
+def compare(results, baseline, threshold):
+    """Return a list of human-readable regressions beyond `threshold` (a fraction)."""
+    regressions = []
+    for section in ("load", "micro"):
+        for key, base in baseline.get(section, {}).items():
+            current = results.get(section, {}).get(key)
+            if current is None:
+                continue
+            for metric in ("p50_ms", "p99_ms"):
+                if metric in base and current[metric] > base[metric] * (1 + threshold):
+                    regressions.append(f"{key} {metric}: {base[metric]} -> {current[metric]}")
+            for metric in ("rps", "ops_per_sec"):
+                if metric in base and current[metric] < base[metric] * (1 - threshold):
+                    regressions.append(f"{key} {metric}: {base[metric]} -> {current[metric]}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated client thread counts")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and concurrency level")
+    parser.add_argument("--scenarios", help="comma-separated subset of scenarios to run")
+    parser.add_argument("--micro-number", type=int, default=100000, help="iterations per micro-benchmark")
+    parser.add_argument("--dns-ttl", type=int, default=0, help="TTL of fake DNS answers (0 bypasses the cache)")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write results as the new baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against this baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed regression as a fraction")
+    args = parser.parse_args(argv)
+
+    start_fake_dns(args.dns_ttl)
+    tcp_port = start_tcp_listener()
+    http_port = start_http_server()
+    app, backend = load_app(tcp_port)
+
+    from werkzeug.serving import make_server
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    _serve(server)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    scenarios = http_scenarios(tcp_port, http_port)
+    if args.scenarios:
+        scenarios = {k: v for k, v in scenarios.items() if k in args.scenarios.split(",")}
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    results = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "valkey": backend,
+            "database": "postgres" if os.environ.get("BENCH_DATABASE_URL") else "memory",
+            "requests": args.requests,
+        },
+        "load": {},
+        "micro": {},
+    }
+
+    print(f"{'scenario':<28}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, scenario in scenarios.items():
+        # Warm pools, caches and the background loop before measuring
+        run_load(base_url, scenario, 1, 5)
+        for concurrency in levels:
+            key = f"{name}@{concurrency}"
+            stats = run_load(base_url, scenario, concurrency, args.requests)
+            results["load"][key] = stats
+            print(f"{key:<28}{stats['rps']:>10}{stats['p50_ms']:>10}{stats['p99_ms']:>10}{stats['errors']:>8}")
+
+    for name, stats in micro_benchmarks(args.micro_number).items():
+        results["micro"][name] = stats
+        print(f"{name:<28}{stats['ops_per_sec']:>10} ops/s")
+
+    server.shutdown()
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())